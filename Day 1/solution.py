@@ -1,27 +1,119 @@
 """solution.py: Solution to Day 1 Advent of Code 2021"""
+from __future__ import annotations
 
 __author__ = "Jacob Taylor Cassady"
 __email__ = "jacobtaylorcassady@outlook.com"
 
-from typing import List
-from numpy import array, diff, count_nonzero, convolve, ones
-from os.path import dirname, join, isfile
+from io import BytesIO
+from json import dumps, loads
+from numpy import array, diff, count_nonzero, concatenate, full, int64, iinfo, fromiter, ndarray
+from numpy.lib.stride_tricks import sliding_window_view
+from os.path import dirname, join, isfile, abspath
+from sys import path as system_path, stdin
+from typing import Any, BinaryIO, Dict, Iterable, List, Tuple, Union
 from unittest import TestCase, main
 
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.loader import load_integers, decode_integers
+from common.snapshot import load_snapshot
+from common.instrumentation import instrument
+
+STREAM_CHUNK_BYTES: int = 1 << 22
+# Depths compared at once per window size sweep block, bounds the (depths, window sizes) comparison matrix.
+WINDOW_SWEEP_BLOCK: int = 1 << 16
+
+class DepthIncreaseCounter(object):
+    def __init__(self, sliding_window_size: int = 3) -> None:
+        """Constructor. Counts single measurement and sliding window increases of depths arriving one at a time or in
+        batches, for live sonar feeds. The last sliding_window_size depths are kept in a ring buffer, all that is
+        needed to compare the next depth with the one leaving its window.
+
+        Args:
+            sliding_window_size (int, optional): Depths per sliding window. Defaults to 3."""
+        assert sliding_window_size >= 1, "Sliding windows hold at least one depth"
+        self.sliding_window_size: int = sliding_window_size
+        self.recent_depths: List[int] = [0] * sliding_window_size
+        self.depth_count: int = 0
+        self.increases: int = 0
+        self.window_increases: int = 0
+
+    def __str__(self) -> str:
+        return str({"depth_count": self.depth_count, "increases": self.increases, "window_increases": self.window_increases})
+
+    def add(self, depth: int) -> None:
+        """Counts one depth in O(1)."""
+        # The slot about to be overwritten holds the depth leaving the window.
+        slot: int = self.depth_count % self.sliding_window_size
+
+        if self.depth_count >= 1 and depth > self.recent_depths[(self.depth_count - 1) % self.sliding_window_size]:
+            self.increases += 1
+        if self.depth_count >= self.sliding_window_size and depth > self.recent_depths[slot]:
+            self.window_increases += 1
+
+        self.recent_depths[slot] = depth
+        self.depth_count += 1
+
+    def extend(self, depths: Iterable[int]) -> None:
+        """Counts a batch of depths with vectorized comparisons, O(1) amortised per depth. Any iterable of depths is
+        accepted, generators included."""
+        carried: array = array(self.chronological_depths(), dtype=int64)
+        batch: array = depths.astype(int64, copy=False) if isinstance(depths, ndarray) else fromiter(depths, dtype=int64)
+        combined: array = concatenate([carried, batch])
+
+        def count_lag_increases(lag: int) -> int:
+            # Only comparisons ending on a new depth count, the carried ones were counted when they arrived.
+            first: int = max(len(carried), lag)
+            return int(count_nonzero(combined[first:] > combined[first - lag:len(combined) - lag])) if len(combined) > first else 0
+
+        self.increases += count_lag_increases(1)
+        self.window_increases += count_lag_increases(self.sliding_window_size)
+
+        self.depth_count += len(batch)
+        self.store_latest_depths(combined[-self.sliding_window_size:].tolist())
+
+    def store_latest_depths(self, latest_depths: List[int]) -> None:
+        """Writes the last depths counted (oldest first) to their ring buffer slots."""
+        for offset, depth in enumerate(latest_depths):
+            self.recent_depths[(self.depth_count - len(latest_depths) + offset) % self.sliding_window_size] = depth
+
+    def chronological_depths(self) -> List[int]:
+        """The last sliding_window_size depths (fewer before that many arrived), oldest first."""
+        if self.depth_count < self.sliding_window_size:
+            return self.recent_depths[:self.depth_count]
+
+        slot: int = self.depth_count % self.sliding_window_size
+        return self.recent_depths[slot:] + self.recent_depths[:slot]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON serializable state, restore() resumes counting from it without replaying the depths."""
+        return {"sliding_window_size": self.sliding_window_size, "depth_count": self.depth_count,
+                "increases": self.increases, "window_increases": self.window_increases,
+                "recent_depths": self.chronological_depths()}
+
+    @staticmethod
+    def restore(state: Dict[str, Any]) -> DepthIncreaseCounter:
+        depth_increase_counter: DepthIncreaseCounter = DepthIncreaseCounter(sliding_window_size=state["sliding_window_size"])
+        depth_increase_counter.depth_count = state["depth_count"]
+        depth_increase_counter.increases = state["increases"]
+        depth_increase_counter.window_increases = state["window_increases"]
+        depth_increase_counter.store_latest_depths(state["recent_depths"])
+        return depth_increase_counter
+
+@instrument()
 def read_input_file(input_file_path: str) -> array:
-    """[summary]
+    """Memory-maps the sonar sweep report and decodes one depth per line. The decoded depths are snapshotted next to
+    the report for later runs.
 
     Args:
         input_file_path (str): [description]
 
     Returns:
-        List[int]: [description]"""
+        array: int32 depths."""
     assert isfile(input_file_path), f"File not found: {input_file_path}"
 
-    with open(input_file_path) as input_file:
-        file_lines: List[str] = input_file.readlines()
-        return array([int(file_line) for file_line in file_lines])
+    return load_snapshot(input_file_path, "depths", load_integers)
 
+@instrument()
 def count_depth_measurement_increases(input_file_path: str) -> int:
     """[summary]
 
@@ -34,6 +126,7 @@ def count_depth_measurement_increases(input_file_path: str) -> int:
     diff_file_data: array = diff(file_data)
     return count_nonzero(diff_file_data > 0)
 
+@instrument()
 def count_sliding_window_depth_measurement_increases(input_file_path: str, sliding_window_size: int = 3) -> int:
     """[summary]
 
@@ -43,10 +136,85 @@ def count_sliding_window_depth_measurement_increases(input_file_path: str, slidi
 
     Returns:
         int: [description]"""
-    file_data: array = read_input_file(input_file_path=input_file_path)
-    sliding_sum: array = convolve(file_data, ones(sliding_window_size, dtype=int), mode='valid')
-    diff_file_data: array = diff(sliding_sum)
-    return count_nonzero(diff_file_data > 0)
+    return count_window_increases(depths=read_input_file(input_file_path=input_file_path), sliding_window_size=sliding_window_size)
+
+@instrument()
+def count_window_increases(depths: array, sliding_window_size: int = 1) -> int:
+    """Counts the sliding window sums of already loaded depths larger than the previous sum.
+
+    Args:
+        depths (array): Depths as returned by read_input_file.
+        sliding_window_size (int, optional): Depths summed per window, 1 compares single depths. Defaults to 1.
+
+    Returns:
+        int: Number of window sums larger than the previous one."""
+    # Consecutive windows share all but their first and last depths, so the sum rises exactly when the depth
+    # entering the window is greater than the one leaving it.
+    return count_nonzero(depths[sliding_window_size:] > depths[:-sliding_window_size])
+
+@instrument()
+def count_depth_measurement_increases_by_window_size(input_file_path: str, maximum_window_size: int,
+                                                     minimum_window_size: int = 1) -> array:
+    """Counts sliding window increases for every window size from minimum_window_size to maximum_window_size with a
+    single load. Each depth is compared with the next maximum_window_size depths at once through a strided view, the
+    depths are padded with a value nothing is greater than so windows running past the end never count.
+
+    Args:
+        input_file_path (str): [description]
+        maximum_window_size (int): Largest window size, included.
+        minimum_window_size (int, optional): Smallest window size. Defaults to 1, single measurement increases.
+
+    Returns:
+        array: int64 increase counts, element i for window size minimum_window_size + i."""
+    assert 1 <= minimum_window_size <= maximum_window_size, "Window sizes must be positive and in increasing order"
+    file_data: array = read_input_file(input_file_path=input_file_path).astype(int64)
+    padded: array = concatenate([file_data, full(maximum_window_size, iinfo(int64).min, dtype=int64)])
+    # Row i holds depth i followed by the maximum_window_size depths after it.
+    windows: array = sliding_window_view(padded, maximum_window_size + 1)[:len(file_data)]
+    increases: array = full(maximum_window_size - minimum_window_size + 1, 0, dtype=int64)
+
+    for block_start in range(0, len(windows), WINDOW_SWEEP_BLOCK):
+        block: array = windows[block_start:block_start + WINDOW_SWEEP_BLOCK]
+        increases += count_nonzero(block[:, minimum_window_size:] > block[:, :1], axis=0)
+
+    return increases
+
+@instrument()
+def stream_depth_measurement_increases(source: Union[str, BinaryIO], sliding_window_size: int = 3,
+                                       chunk_bytes: int = STREAM_CHUNK_BYTES) -> Tuple[int, int]:
+    """Counts single measurement and sliding window increases in one pass over a sonar sweep report of any size.
+    The report is read chunk_bytes at a time; the digits after the last newline of a chunk and the last
+    sliding_window_size depths are carried over to the next one, so memory stays bounded by the chunk size.
+
+    Args:
+        source (Union[str, BinaryIO]): Path to the report, "-" for stdin, or a binary file object.
+        sliding_window_size (int, optional): Depths per sliding window. Defaults to 3.
+        chunk_bytes (int, optional): Bytes read at a time. Defaults to 4 MiB.
+
+    Returns:
+        Tuple[int, int]: Single measurement increases and sliding window increases."""
+    if isinstance(source, str) and source != "-":
+        assert isfile(source), f"File not found: {source}"
+        with open(source, "rb") as report_file:
+            return stream_depth_measurement_increases(report_file, sliding_window_size=sliding_window_size, chunk_bytes=chunk_bytes)
+
+    report_file: BinaryIO = stdin.buffer if source == "-" else source
+    depth_increase_counter: DepthIncreaseCounter = DepthIncreaseCounter(sliding_window_size=sliding_window_size)
+    carried_bytes: bytes = b""
+
+    for chunk in iter(lambda: report_file.read(chunk_bytes), b""):
+        # A depth split across two chunks is only decoded once its line is complete.
+        last_newline: int = chunk.rfind(b"\n")
+        if last_newline == -1:
+            carried_bytes += chunk
+            continue
+
+        depth_increase_counter.extend(decode_integers(carried_bytes + chunk[:last_newline + 1], dtype=int64))
+        carried_bytes = chunk[last_newline + 1:]
+
+    depth_increase_counter.extend(decode_integers(carried_bytes, dtype=int64))
+
+    return depth_increase_counter.increases, depth_increase_counter.window_increases
 
 class Examples(TestCase):
     def test_part_one_example(self) -> None:
@@ -65,6 +233,72 @@ class Examples(TestCase):
 
         print(f"Unittest {Examples.test_part_two_example} was successful.")
 
+    def test_count_window_increases_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_count_window_increases_example}")
+
+        depths: array = read_input_file(input_file_path=join(dirname(__file__), "example.txt"))
+        self.assertEqual([count_window_increases(depths=depths, sliding_window_size=size) for size in (1, 3)], [7, 5])
+
+        print(f"Unittest {Examples.test_count_window_increases_example} was successful.")
+
+    def test_streaming_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_streaming_example}")
+
+        # Chunks as small as a few bytes split depths and windows across chunk boundaries.
+        for chunk_bytes in [1, 3, 7, 64, STREAM_CHUNK_BYTES]:
+            self.assertEqual(stream_depth_measurement_increases(join(dirname(__file__), "example.txt"), chunk_bytes=chunk_bytes), (7, 5))
+
+        with open(join(dirname(__file__), "example.txt"), "rb") as example_file:
+            self.assertEqual(stream_depth_measurement_increases(BytesIO(example_file.read().rstrip()), chunk_bytes=5), (7, 5))
+
+        print(f"Unittest {Examples.test_streaming_example} was successful.")
+
+    def test_depth_increase_counter_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_depth_increase_counter_example}")
+
+        example_depths: List[int] = read_input_file(input_file_path=join(dirname(__file__), "example.txt")).tolist()
+
+        one_at_a_time: DepthIncreaseCounter = DepthIncreaseCounter()
+        for depth in example_depths:
+            one_at_a_time.add(depth)
+        self.assertEqual((one_at_a_time.increases, one_at_a_time.window_increases), (7, 5))
+
+        in_batches: DepthIncreaseCounter = DepthIncreaseCounter()
+        in_batches.extend(example_depths[:2])
+        in_batches.add(example_depths[2])
+        in_batches.extend(example_depths[3:7])
+        # A consumer restarted from a JSON snapshot resumes without the depths seen before it.
+        resumed: DepthIncreaseCounter = DepthIncreaseCounter.restore(loads(dumps(in_batches.snapshot())))
+        resumed.add(example_depths[7])
+        resumed.extend(example_depths[8:])
+        self.assertEqual((resumed.increases, resumed.window_increases), (7, 5))
+        self.assertEqual(resumed.chronological_depths(), example_depths[-3:])
+
+        print(f"Unittest {Examples.test_depth_increase_counter_example} was successful.")
+
+    def test_depth_increase_counter_generator_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_depth_increase_counter_generator_example}")
+
+        example_depths: List[int] = read_input_file(input_file_path=join(dirname(__file__), "example.txt")).tolist()
+
+        depth_increase_counter: DepthIncreaseCounter = DepthIncreaseCounter()
+        depth_increase_counter.extend(depth for depth in example_depths[:4])
+        depth_increase_counter.extend(iter(example_depths[4:]))
+        self.assertEqual((depth_increase_counter.increases, depth_increase_counter.window_increases), (7, 5))
+
+        print(f"Unittest {Examples.test_depth_increase_counter_generator_example} was successful.")
+
+    def test_window_size_sweep_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_window_size_sweep_example}")
+
+        example_file_path: str = join(dirname(__file__), "example.txt")
+        self.assertEqual(count_depth_measurement_increases_by_window_size(example_file_path, maximum_window_size=3).tolist()[::2], [7, 5])
+        self.assertEqual(count_depth_measurement_increases_by_window_size(example_file_path, maximum_window_size=12, minimum_window_size=2).tolist(),
+                         [count_sliding_window_depth_measurement_increases(example_file_path, sliding_window_size=window_size)
+                          for window_size in range(2, 13)])
+
+        print(f"Unittest {Examples.test_window_size_sweep_example} was successful.")
+
 
 class Solutions(TestCase):
     def test_part_one(self) -> None:
@@ -81,6 +315,16 @@ class Solutions(TestCase):
 
         print(f"Part two solution calculated to be: {depth_measurement_increase_count}.")
 
+    def test_streaming(self) -> None:
+        print(f"\nCalculating solution to {Solutions.test_streaming}")
+
+        input_file_path: str = join(dirname(__file__), "input.txt")
+        self.assertEqual(stream_depth_measurement_increases(input_file_path, chunk_bytes=4096),
+                         (count_depth_measurement_increases(input_file_path=input_file_path),
+                          count_sliding_window_depth_measurement_increases(input_file_path=input_file_path)))
+
+        print(f"Unittest {Solutions.test_streaming} was successful.")
+
 
 if __name__ == "__main__":
     main()
@@ -7,10 +7,15 @@ __email__ = "jacobtaylorcassady@outlook.com"
 # Built-in modules
 from unittest import TestCase, main
 from enum import unique, Enum
-from os.path import isfile, join, dirname
+from os.path import isfile, join, dirname, abspath
+from sys import path as system_path
 from typing import List, Union
 from math import floor
 
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.instrumentation import instrument
+
 @unique
 class PART(Enum):
     ONE: str = "one"
@@ -71,6 +76,7 @@ class NavigationSubsystem(object):
     def __init__(self, navigation_subsystem_report: List[str]) -> None:
         self.navigation_subsystem_report: List[str] = navigation_subsystem_report
 
+    @instrument()
     def get_corrupted_syntax_error_score(self) -> int:
         def get_first_illegal_character(remaining_report_line: str) -> Union[str, None]:
             reduced: bool = False
@@ -100,6 +106,7 @@ class NavigationSubsystem(object):
 
         return score
 
+    @instrument()
     def get_incomplete_syntax_error_score(self) -> int:
         def get_syntax_needed_for_compeletion(remaining_report_line: str) -> Union[None, str]:
             reduced: bool = False
@@ -138,6 +145,7 @@ class NavigationSubsystem(object):
         return scores[floor(len(scores) / 2)]
 
     @staticmethod
+    @instrument()
     def load(puzzle_input_file_path: str) -> NavigationSubsystem:
         assert isfile(puzzle_input_file_path), f"File not found: {puzzle_input_file_path}"
 
@@ -6,16 +6,24 @@ __email__ = "jacobtaylorcassady@outlook.com"
 
 # Built-in modules
 from unittest import TestCase, main
-from os.path import isfile, join, dirname
-from typing import Union, List, Tuple
+from os.path import isfile, join, dirname, abspath
+from sys import path as system_path
+from typing import Tuple
 
 # 3rd Party modules
 from numpy import array, where, zeros, alltrue
 
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.loader import load_digit_grid
+from common.snapshot import load_snapshot
+from common.instrumentation import instrument
+
 class OctopusConsortium(object):
     def __init__(self, octopuses: array) -> None:
         self.octopuses: array = octopuses
 
+    @instrument()
     def find_first_syncronization(self) -> int:
         flash_count: int = self.pass_time(1)
         epoch_count: int = 1
@@ -26,6 +34,7 @@ class OctopusConsortium(object):
 
         return epoch_count
 
+    @instrument()
     def pass_time(self, epochs: int) -> int:
         flash_count: int = 0
 
@@ -51,16 +60,12 @@ class OctopusConsortium(object):
         return alltrue(flashed[flash_indices])
 
     @staticmethod
+    @instrument()
     def load(puzzle_input_file_path: str) -> OctopusConsortium:
         assert isfile(puzzle_input_file_path), f"File not found: {puzzle_input_file_path}"
 
-        octopuses: Union[List[array], array] = []
-
-        with open(puzzle_input_file_path) as puzzle_input_file:
-            for puzzle_line in puzzle_input_file.readlines():
-                octopuses.append(array([int(octopus_brightness) for octopus_brightness in puzzle_line[:-1]]))
-
-        return OctopusConsortium(octopuses=array(octopuses))
+        # Copy-on-write snapshot, pass_time updates the energy levels in place.
+        return OctopusConsortium(octopuses=load_snapshot(puzzle_input_file_path, "digit_grid", load_digit_grid))
 
 
 class Examples(TestCase):
@@ -7,9 +7,14 @@ __email__ = "jacobtaylorcassady@outlook.com"
 # Built-in modules
 from unittest import TestCase, main
 from copy import copy
-from os.path import isfile, join, dirname
-from typing import Dict, List
-from parse import parse, Result
+from os.path import isfile, join, dirname, abspath
+from sys import path as system_path
+from typing import Dict, List, Tuple
+
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.instrumentation import instrument
+from common.tokenizer import load_edges
 
 
 class Cave(object):
@@ -33,6 +38,7 @@ class CaveSystem(object):
     def __init__(self, caves: Dict[str, Cave]) -> None:
         self.caves: Dict[str, Cave] = caves
 
+    @instrument()
     def count_paths_that_visit_small_caves_at_most_n_times(self, n: int) -> int:
         """Breadth First Search."""
         start_cave: Cave = self.caves['start']
@@ -64,6 +70,7 @@ class CaveSystem(object):
         return len(valid_paths)
 
     @staticmethod
+    @instrument()
     def count_small_cave_frequencies(path: List[Cave]) -> Dict[Cave, int]:
         small_cave_frequencies: Dict[Cave, int] = {}
 
@@ -77,21 +84,17 @@ class CaveSystem(object):
         return small_cave_frequencies
 
     @staticmethod
+    @instrument()
     def load(puzzle_input_file_path: str) -> CaveSystem:
         assert isfile(puzzle_input_file_path), f"File not found: {puzzle_input_file_path}"
         caves: Dict[str, Cave] = {}
+        cave_connections: List[Tuple[str, str]] = load_edges(puzzle_input_file_path)
 
-        with open(puzzle_input_file_path) as puzzle_input_file:
-            cave_connections: List[Result] = [parse(Cave.FORMAT_CONNECTION, cave_connection) for cave_connection in puzzle_input_file.readlines()]
-
-            for cave_connection in cave_connections:
-                left_cave: str = cave_connection[0]
-                right_cave: str = cave_connection[1]
-
-                if left_cave not in caves: caves[left_cave] = Cave(name=left_cave)
-                if right_cave not in caves: caves[right_cave] = Cave(name=right_cave)
-                caves[left_cave].add_connection(caves[right_cave])
-                caves[right_cave].add_connection(caves[left_cave])
+        for left_cave, right_cave in cave_connections:
+            if left_cave not in caves: caves[left_cave] = Cave(name=left_cave)
+            if right_cave not in caves: caves[right_cave] = Cave(name=right_cave)
+            caves[left_cave].add_connection(caves[right_cave])
+            caves[right_cave].add_connection(caves[left_cave])
 
         return CaveSystem(caves=caves)
 
@@ -4,11 +4,28 @@ from __future__ import annotations
 __author__ = "Jacob Taylor Cassady"
 __email__ = "jacobtaylorcassady@outlook.com"
 
-from typing import List
+from functools import reduce
+from os import cpu_count
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 from enum import Enum, unique
-from os.path import dirname, join, isfile
+from os.path import dirname, join, isfile, abspath
+from sys import path as system_path
 from unittest import TestCase, main
-from parse import parse
+
+# 3rd Party modules
+from numpy import array, concatenate, cumsum, int8, int64, where, zeros, maximum, searchsorted
+
+# concurrent.futures and multiprocessing only serve process pools, they are imported where a pool starts to keep startup fast.
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.days import SolutionFunction
+from common.instrumentation import instrument
+from common.loader import NEWLINE, map_file
+from common.snapshot import load_snapshot
+from common.tokenizer import load_commands, tokenize_commands
 
 @unique
 class PART(Enum):
@@ -21,6 +38,11 @@ class DIRECTION(Enum):
     DOWN: str = "down"
     UP: str = "up"
 
+# Direction codes of the vectorized command logs, the DIRECTION declaration order.
+DAY: int = 2
+REPOSITORY_DIRECTORY: str = dirname(dirname(abspath(__file__)))
+DIRECTION_CODES: Dict[DIRECTION, int] = {direction: code for code, direction in enumerate(DIRECTION)}
+
 class Action(object):
     FORMAT_STRING: str = "{} {}"
 
@@ -47,6 +69,7 @@ class Submarine(object):
     def evaluate(self) -> int:
         return self.depth * self.horizontal_position
 
+    @instrument()
     def perform_action(self, action: Action, part: PART) -> None:
         """[summary]
 
@@ -68,6 +91,260 @@ class Submarine(object):
             elif action.direction == DIRECTION.UP:
                 self.aim -= action.units
 
+    @instrument()
+    def perform_command_log(self, direction_codes: array, units: array, part: PART) -> None:
+        """Performs a whole command log at once, same result as perform_action on each of its actions.
+
+        Part one depth and part two aim both move by the down minus up units. Part two depth grows by the units of
+        each forward times the aim at that step, a cumulative sum of the aim changes.
+
+        Args:
+            direction_codes (array): DIRECTION_CODES of each command.
+            units (array): Units of each command."""
+        units = units.astype(int64, copy=False)
+        forward_units: array = where(direction_codes == DIRECTION_CODES[DIRECTION.FORWARD], units, 0)
+        vertical_units: array = where(direction_codes == DIRECTION_CODES[DIRECTION.DOWN], units, 0) - \
+                                where(direction_codes == DIRECTION_CODES[DIRECTION.UP], units, 0)
+
+        self.horizontal_position += int(forward_units.sum())
+
+        if part == PART.ONE:
+            self.depth += int(vertical_units.sum())
+        elif part == PART.TWO:
+            aims: array = self.aim + cumsum(vertical_units)
+            self.depth += int((forward_units * aims).sum())
+            self.aim = int(aims[-1]) if len(aims) > 0 else self.aim
+
+class CourseSummary(object):
+    def __init__(self, horizontal_position: int = 0, aim: int = 0, depth: int = 0) -> None:
+        """Constructor. Net effect of a stretch of the course on a submarine starting at the origin with no aim: the
+        horizontal distance, the aim change (also the part one depth change) and the part two depth change.
+
+        Summaries of consecutive stretches merge associatively, so a course can be summarized in independent shards.
+        The second stretch's forwards were computed with an aim of 0, starting with the first stretch's aim adds that
+        aim times the second stretch's horizontal distance to its depth."""
+        self.horizontal_position: int = horizontal_position
+        self.aim: int = aim
+        self.depth: int = depth
+
+    def __str__(self) -> str:
+        return str({"horizontal_position": self.horizontal_position, "aim": self.aim, "depth": self.depth})
+
+    def merge(self, following: CourseSummary) -> CourseSummary:
+        return CourseSummary(horizontal_position=self.horizontal_position + following.horizontal_position,
+                             aim=self.aim + following.aim,
+                             depth=self.depth + following.depth + self.aim * following.horizontal_position)
+
+    def evaluate(self, part: PART) -> int:
+        return self.horizontal_position * (self.aim if part == PART.ONE else self.depth)
+
+    @staticmethod
+    def summarize(direction_codes: array, units: array) -> CourseSummary:
+        submarine: Submarine = Submarine()
+        submarine.perform_command_log(direction_codes=direction_codes, units=units, part=PART.TWO)
+        return CourseSummary(horizontal_position=submarine.horizontal_position, aim=submarine.aim, depth=submarine.depth)
+
+class TrajectoryIndex(object):
+    # Rows of the trajectory table, column k is the state after k steps.
+    HORIZONTAL_POSITION, AIM, DEPTH, MAXIMUM_AIM, MAXIMUM_DEPTH = range(5)
+
+    def __init__(self, trajectory: array) -> None:
+        """Constructor.
+
+        Args:
+            trajectory (array): int64 table of shape (5, steps + 1) built by build_trajectory. Part one depth is the
+                part two aim, and running maxima of both depths make first_step_deeper_than a binary search."""
+        self.trajectory: array = trajectory
+
+    def __len__(self) -> int:
+        """Number of steps in the course."""
+        return self.trajectory.shape[1] - 1
+
+    def state(self, step: int, part: PART) -> Submarine:
+        """Submarine after the first step commands of the course, in O(1)."""
+        submarine: Submarine = Submarine()
+        submarine.horizontal_position = int(self.trajectory[TrajectoryIndex.HORIZONTAL_POSITION, step])
+
+        if part == PART.ONE:
+            submarine.depth = int(self.trajectory[TrajectoryIndex.AIM, step])
+        elif part == PART.TWO:
+            submarine.depth = int(self.trajectory[TrajectoryIndex.DEPTH, step])
+            submarine.aim = int(self.trajectory[TrajectoryIndex.AIM, step])
+
+        return submarine
+
+    def first_step_deeper_than(self, depth: int, part: PART) -> Optional[int]:
+        """Fewest steps after which the submarine is deeper than depth, in O(log steps).
+
+        Returns:
+            Optional[int]: Step count, None when the course never goes that deep."""
+        maximum_depths: array = self.trajectory[TrajectoryIndex.MAXIMUM_AIM if part == PART.ONE else TrajectoryIndex.MAXIMUM_DEPTH]
+        step: int = int(searchsorted(maximum_depths, depth, side="right"))
+        return step if step <= len(self) else None
+
+    @staticmethod
+    def build_trajectory(direction_codes: array, units: array) -> array:
+        units = units.astype(int64, copy=False)
+        forward_units: array = where(direction_codes == DIRECTION_CODES[DIRECTION.FORWARD], units, 0)
+        vertical_units: array = where(direction_codes == DIRECTION_CODES[DIRECTION.DOWN], units, 0) - \
+                                where(direction_codes == DIRECTION_CODES[DIRECTION.UP], units, 0)
+
+        trajectory: array = zeros((5, len(units) + 1), dtype=int64)
+        cumsum(forward_units, out=trajectory[TrajectoryIndex.HORIZONTAL_POSITION, 1:])
+        cumsum(vertical_units, out=trajectory[TrajectoryIndex.AIM, 1:])
+        # Forwards leave the aim unchanged, the aim after a forward step is the one it was taken with.
+        cumsum(forward_units * trajectory[TrajectoryIndex.AIM, 1:], out=trajectory[TrajectoryIndex.DEPTH, 1:])
+        maximum.accumulate(trajectory[TrajectoryIndex.AIM], out=trajectory[TrajectoryIndex.MAXIMUM_AIM])
+        maximum.accumulate(trajectory[TrajectoryIndex.DEPTH], out=trajectory[TrajectoryIndex.MAXIMUM_DEPTH])
+        return trajectory
+
+    @staticmethod
+    def parse_trajectory(input_file_path: str) -> array:
+        return TrajectoryIndex.build_trajectory(*read_command_log(input_file_path=input_file_path))
+
+    @staticmethod
+    @instrument()
+    def load(input_file_path: str, persist: bool = True) -> TrajectoryIndex:
+        """Builds the trajectory index of a planned course.
+
+        Args:
+            input_file_path (str): relative or absolute path to the planned course.
+            persist (bool, optional): Store the table next to the course and memory-map it back on later loads.
+                Defaults to True."""
+        assert isfile(input_file_path), f"File not found: {input_file_path}"
+
+        if persist:
+            return TrajectoryIndex(trajectory=load_snapshot(input_file_path, "trajectory", TrajectoryIndex.parse_trajectory))
+
+        return TrajectoryIndex(trajectory=TrajectoryIndex.parse_trajectory(input_file_path))
+
+class Fleet(object):
+    def __init__(self, direction_codes: array, units: array, offsets: array) -> None:
+        """Constructor. Command logs of many submarines packed end to end, log i being commands offsets[i] to
+        offsets[i + 1]. Logs may have any length, empty ones included.
+
+        Args:
+            direction_codes (array): DIRECTION_CODES of every command of every log.
+            units (array): Units of every command of every log.
+            offsets (array): int64 log boundaries, one more than there are logs."""
+        self.direction_codes: array = direction_codes
+        self.units: array = units.astype(int64, copy=False)
+        self.offsets: array = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @instrument()
+    def final_states(self) -> CourseSummary:
+        """Final state of every submarine at once. Sums per log are differences of a single cumulative sum over the
+        whole fleet taken at the log boundaries, so the cost does not depend on how many logs there are.
+
+        Returns:
+            CourseSummary: With int64 arrays, one element per log, in place of integers."""
+        forward_units: array = where(self.direction_codes == DIRECTION_CODES[DIRECTION.FORWARD], self.units, 0)
+        vertical_units: array = where(self.direction_codes == DIRECTION_CODES[DIRECTION.DOWN], self.units, 0) - \
+                                where(self.direction_codes == DIRECTION_CODES[DIRECTION.UP], self.units, 0)
+
+        def log_sums(values: array) -> Tuple[array, array]:
+            running_totals: array = concatenate([zeros(1, dtype=int64), cumsum(values)])
+            return running_totals, running_totals[self.offsets[1:]] - running_totals[self.offsets[:-1]]
+
+        _, horizontal_positions = log_sums(forward_units)
+        running_aims, aims = log_sums(vertical_units)
+        # Forwards are taken with the fleet's running aim, each log's aim starts from 0 instead: remove the running aim
+        # the fleet had reached when the log started from every forward of the log.
+        _, depths = log_sums(forward_units * running_aims[1:])
+        depths -= running_aims[self.offsets[:-1]] * horizontal_positions
+
+        return CourseSummary(horizontal_position=horizontal_positions, aim=aims, depth=depths)
+
+    @staticmethod
+    def pack(command_logs: Sequence[Tuple[array, array]]) -> Fleet:
+        """Packs (direction codes, units) command logs as returned by read_command_log."""
+        lengths: List[int] = [len(units) for _, units in command_logs]
+        offsets: array = concatenate([zeros(1, dtype=int64), cumsum(array(lengths, dtype=int64))])
+
+        if len(command_logs) == 0:
+            return Fleet(direction_codes=zeros(0, dtype=int8), units=zeros(0, dtype=int64), offsets=offsets)
+
+        return Fleet(direction_codes=concatenate([direction_codes for direction_codes, _ in command_logs]),
+                     units=concatenate([units for _, units in command_logs]), offsets=offsets)
+
+    @staticmethod
+    @instrument()
+    def load(input_file_paths: Sequence[str]) -> Fleet:
+        return Fleet.pack([read_command_log(input_file_path=input_file_path) for input_file_path in input_file_paths])
+
+@instrument()
+def summarize_byte_range(input_file_path: str, start: int, end: int) -> CourseSummary:
+    """Summarizes the commands whose line starts within [start, end) of the planned course. Any byte range can be
+    given, lines cut by it belong to the range holding their first byte."""
+    buffer: array = map_file(input_file_path)
+
+    def line_boundary(offset: int) -> int:
+        # First line start at or after offset.
+        while 0 < offset < len(buffer) and buffer[offset - 1] != NEWLINE:
+            offset += 1
+        return min(offset, len(buffer))
+
+    direction_codes, units = tokenize_commands(buffer[line_boundary(start):line_boundary(end)],
+                                               words=[direction.value for direction in DIRECTION], dtype=int64)
+    return CourseSummary.summarize(direction_codes=direction_codes, units=units)
+
+def _summarize_byte_range_fields(input_file_path: str, start: int, end: int) -> Tuple[int, int, int]:
+    """summarize_byte_range for pool workers: plain integers unpickle in any process, a CourseSummary only where the
+    module defining it is importable under the worker's name for it."""
+    course_summary: CourseSummary = summarize_byte_range(input_file_path=input_file_path, start=start, end=end)
+    return int(course_summary.horizontal_position), int(course_summary.aim), int(course_summary.depth)
+
+@instrument()
+def summarize_course_file(input_file_path: str, workers: Optional[int] = None, shards: Optional[int] = None,
+                          mp_context: Optional[BaseContext] = None) -> CourseSummary:
+    """Summarizes a planned course of any size by byte range shards in a process pool, merging the shard summaries
+    in course order.
+
+    Args:
+        input_file_path (str): relative or absolute path to the planned course.
+        workers (Optional[int], optional): Process count, 1 summarizes the shards in this process. Defaults to one
+            per core.
+        shards (Optional[int], optional): Byte ranges the course is split into. Defaults to four per worker.
+        mp_context (Optional[BaseContext], optional): Start method of the workers. Defaults to the platform's.
+
+    Returns:
+        CourseSummary: Summary of the whole course."""
+    assert isfile(input_file_path), f"File not found: {input_file_path}"
+    workers = workers or cpu_count()
+    shards = shards or 4 * workers
+    size: int = len(map_file(input_file_path))
+    boundaries: List[int] = [size * shard // shards for shard in range(shards + 1)]
+    shard_arguments: Tuple[List[str], List[int], List[int]] = ([input_file_path] * shards, boundaries[:-1], boundaries[1:])
+
+    if workers == 1:
+        shard_summaries: List[CourseSummary] = list(map(summarize_byte_range, *shard_arguments))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # The workers reach this module through its file, it may not be importable by name in a spawned process.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            shard_summaries = [CourseSummary(*fields) for fields in executor.map(
+                SolutionFunction(day=DAY, function_name="_summarize_byte_range_fields", repository_directory=REPOSITORY_DIRECTORY),
+                *shard_arguments)]
+
+    return reduce(CourseSummary.merge, shard_summaries, CourseSummary())
+
+@instrument()
+def read_command_log(input_file_path: str) -> Tuple[array, array]:
+    """Tokenizes the planned course into parallel arrays for Submarine.perform_command_log.
+
+    Args:
+        input_file_path (str): relative or absolute path to the planned course.
+
+    Returns:
+        Tuple[array, array]: int8 DIRECTION_CODES and int64 units of each command."""
+    assert isfile(input_file_path), f"File not found: {input_file_path}"
+    return load_commands(input_file_path, words=[direction.value for direction in DIRECTION], dtype=int64)
+
+@instrument()
 def read_input_file(input_file_path: str) -> List[Action]:
     """[summary]
 
@@ -77,14 +354,11 @@ def read_input_file(input_file_path: str) -> List[Action]:
     Returns:
         List[int]: [description]"""
     assert isfile(input_file_path), f"File not found: {input_file_path}"
-    actions: List[Action] = []
-
-    with open(input_file_path) as input_file:
-        for file_line in input_file.readlines():
-            direction, units = parse(Action.FORMAT_STRING, file_line)
-            actions.append(Action(direction=DIRECTION(direction), units=int(units)))
+    directions: List[DIRECTION] = list(DIRECTION)
+    direction_codes, units = load_commands(input_file_path, words=[direction.value for direction in directions])
 
-    return actions
+    return [Action(direction=directions[direction_code], units=unit)
+            for direction_code, unit in zip(direction_codes.tolist(), units.tolist())]
 
 class Examples(TestCase):
     def test_part_one_example(self) -> None:
@@ -117,6 +391,92 @@ class Examples(TestCase):
 
         print(f"Unittest {Examples.test_part_two_example} was successful.")
 
+    def test_command_log_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_command_log_example}")
+        direction_codes, units = read_command_log(input_file_path=join(dirname(__file__), "example.txt"))
+
+        for part, (depth, expected) in {PART.ONE: (10, 150), PART.TWO: (60, 900)}.items():
+            example_submarine: Submarine = Submarine()
+            example_submarine.perform_command_log(direction_codes=direction_codes, units=units, part=part)
+
+            self.assertEqual(example_submarine.horizontal_position, 15)
+            self.assertEqual(example_submarine.depth, depth)
+            self.assertEqual(example_submarine.evaluate(), expected)
+
+        # Logs split in two continue from the state the first half left.
+        example_submarine = Submarine()
+        example_submarine.perform_command_log(direction_codes=direction_codes[:3], units=units[:3], part=PART.TWO)
+        example_submarine.perform_command_log(direction_codes=direction_codes[3:], units=units[3:], part=PART.TWO)
+        self.assertEqual(example_submarine.evaluate(), 900)
+
+        print(f"Unittest {Examples.test_command_log_example} was successful.")
+
+    def test_sharded_summary_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_sharded_summary_example}")
+        from multiprocessing import get_context
+
+        example_file_path: str = join(dirname(__file__), "example.txt")
+
+        # Down to a shard per few bytes, most shards cut lines or hold none.
+        for shards in [1, 2, 5, 17, 60]:
+            course_summary: CourseSummary = summarize_course_file(example_file_path, workers=1, shards=shards)
+            self.assertEqual(course_summary.evaluate(part=PART.ONE), 150)
+            self.assertEqual(course_summary.evaluate(part=PART.TWO), 900)
+
+        self.assertEqual(str(summarize_course_file(example_file_path, workers=2, shards=3)),
+                         str(summarize_course_file(example_file_path, workers=1, shards=1)))
+        self.assertEqual(str(summarize_course_file(example_file_path, workers=2, shards=3, mp_context=get_context("spawn"))),
+                         str(summarize_course_file(example_file_path, workers=1, shards=1)))
+
+        print(f"Unittest {Examples.test_sharded_summary_example} was successful.")
+
+    def test_trajectory_index_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_trajectory_index_example}")
+        example_file_path: str = join(dirname(__file__), "example.txt")
+        trajectory_index: TrajectoryIndex = TrajectoryIndex.load(example_file_path, persist=False)
+        actions: List[Action] = read_input_file(input_file_path=example_file_path)
+        self.assertEqual(len(trajectory_index), len(actions))
+
+        for part in PART:
+            submarine: Submarine = Submarine()
+            self.assertEqual(str(trajectory_index.state(0, part=part)), str(submarine))
+
+            for step, action in enumerate(actions, start=1):
+                submarine.perform_action(action=action, part=part)
+                self.assertEqual(str(trajectory_index.state(step, part=part)), str(submarine))
+                self.assertEqual(trajectory_index.state(step, part=part).aim, submarine.aim)
+
+        # Part one depths 0, 0, 5, 5, 2, 10, 10; part two depths 0, 0, 0, 40, 40, 40, 60.
+        self.assertEqual(trajectory_index.first_step_deeper_than(4, part=PART.ONE), 2)
+        self.assertEqual(trajectory_index.first_step_deeper_than(5, part=PART.ONE), 5)
+        self.assertEqual(trajectory_index.first_step_deeper_than(40, part=PART.TWO), 6)
+        self.assertEqual(trajectory_index.first_step_deeper_than(-1, part=PART.TWO), 0)
+        self.assertIsNone(trajectory_index.first_step_deeper_than(60, part=PART.TWO))
+
+        print(f"Unittest {Examples.test_trajectory_index_example} was successful.")
+
+    def test_fleet_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_fleet_example}")
+        direction_codes, units = read_command_log(input_file_path=join(dirname(__file__), "example.txt"))
+        # Ragged logs: the example, an empty log, its last two commands ("down 8", "forward 2") and the example again.
+        command_logs: List[Tuple[array, array]] = [(direction_codes, units), (direction_codes[:0], units[:0]),
+                                                   (direction_codes[-2:], units[-2:]), (direction_codes, units)]
+        final_states: CourseSummary = Fleet.pack(command_logs).final_states()
+
+        for part in PART:
+            expected: List[int] = []
+            for log_direction_codes, log_units in command_logs:
+                submarine: Submarine = Submarine()
+                submarine.perform_command_log(direction_codes=log_direction_codes, units=log_units, part=part)
+                expected.append(submarine.evaluate())
+
+            self.assertEqual(final_states.evaluate(part=part).tolist(), expected)
+
+        self.assertEqual(final_states.evaluate(part=PART.TWO).tolist(), [900, 0, 2 * 16, 900])
+        self.assertEqual(len(Fleet.pack([]).final_states().horizontal_position), 0)
+
+        print(f"Unittest {Examples.test_fleet_example} was successful.")
+
 class Solutions(TestCase):
     def test_part_one(self) -> None:
         print(f"\nCalculating solution to {Solutions.test_part_one}")
@@ -140,5 +500,52 @@ class Solutions(TestCase):
 
         print(f"Part two solution calculated to be: {submarine.evaluate()}.")
 
+    def test_command_log(self) -> None:
+        print(f"\nCalculating solution to {Solutions.test_command_log}")
+        input_file_path: str = join(dirname(__file__), "input.txt")
+        direction_codes, units = read_command_log(input_file_path=input_file_path)
+
+        for part in PART:
+            submarine: Submarine = Submarine()
+            for action in read_input_file(input_file_path=input_file_path):
+                submarine.perform_action(action=action, part=part)
+
+            vectorized_submarine: Submarine = Submarine()
+            vectorized_submarine.perform_command_log(direction_codes=direction_codes, units=units, part=part)
+            self.assertEqual(str(vectorized_submarine), str(submarine))
+            self.assertEqual(vectorized_submarine.aim, submarine.aim)
+
+        print(f"Unittest {Solutions.test_command_log} was successful.")
+
+    def test_sharded_summary(self) -> None:
+        print(f"\nCalculating solution to {Solutions.test_sharded_summary}")
+        input_file_path: str = join(dirname(__file__), "input.txt")
+        course_summary: CourseSummary = summarize_course_file(input_file_path, workers=4, shards=13)
+
+        for part in PART:
+            submarine: Submarine = Submarine()
+            submarine.perform_command_log(*read_command_log(input_file_path=input_file_path), part=part)
+            self.assertEqual(course_summary.evaluate(part=part), submarine.evaluate())
+
+        print(f"Unittest {Solutions.test_sharded_summary} was successful.")
+
+    def test_trajectory_index(self) -> None:
+        print(f"\nCalculating solution to {Solutions.test_trajectory_index}")
+        input_file_path: str = join(dirname(__file__), "input.txt")
+        # Loaded twice, the second load memory-maps the persisted table.
+        TrajectoryIndex.load(input_file_path)
+        trajectory_index: TrajectoryIndex = TrajectoryIndex.load(input_file_path)
+
+        for part in PART:
+            submarine: Submarine = Submarine()
+            submarine.perform_command_log(*read_command_log(input_file_path=input_file_path), part=part)
+            self.assertEqual(trajectory_index.state(len(trajectory_index), part=part).evaluate(), submarine.evaluate())
+
+            first_step: int = trajectory_index.first_step_deeper_than(submarine.depth // 2, part=part)
+            self.assertGreater(trajectory_index.state(first_step, part=part).depth, submarine.depth // 2)
+            self.assertLessEqual(trajectory_index.state(first_step - 1, part=part).depth, submarine.depth // 2)
+
+        print(f"Unittest {Solutions.test_trajectory_index} was successful.")
+
 if __name__ == "__main__":
     main()
@@ -5,24 +5,111 @@ __author__ = "Jacob Taylor Cassady"
 __email__ = "jacobtaylorcassady@outlook.com"
 
 # Built-in modules
-from typing import List
-from os.path import isfile, join, dirname
+from os.path import isfile, join, dirname, abspath
+from sys import path as system_path
+from typing import Iterable, List
 from unittest import TestCase, main
 
 # 3rd Party modules
-from numpy import array
-from scipy.stats import mode
-from scipy.stats.mstats_basic import ModeResult
+from numpy import array, uint8, uint64, zeros, count_nonzero, flatnonzero, packbits, lexsort, sort
+from numpy.random import default_rng
+
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.loader import load_digit_grid
+from common.snapshot import load_snapshot
+from common.instrumentation import instrument
+
+# Widest report line packed into a single unsigned integer, wider ones are packed into bytes.
+MAXIMUM_INTEGER_WIDTH: int = 64
+
+
+class PackedDiagnosticValues(object):
+    def __init__(self, packed_values: array, width: int) -> None:
+        """Constructor.
+
+        Args:
+            packed_values (array): One uint64 per report line for widths up to 64 bits, otherwise numpy.packbits rows.
+            width (int): Bits per report line."""
+        self.packed_values: array = packed_values
+        self.width: int = width
+
+    def __len__(self) -> int:
+        return len(self.packed_values)
+
+    def column_bits(self, column_index: int) -> array:
+        """Bit column_index (0 being the most significant) of every report line."""
+        if self.width <= MAXIMUM_INTEGER_WIDTH:
+            return (self.packed_values >> uint64(self.width - 1 - column_index)) & uint64(1)
+
+        return (self.packed_values[:, column_index // 8] >> uint8(7 - column_index % 8)) & uint8(1)
+
+    def column_one_counts(self) -> array:
+        """Number of report lines with a 1 in each bit position, most significant first."""
+        return array([count_nonzero(self.column_bits(column_index)) for column_index in range(self.width)])
+
+    def bit(self, index: int, column_index: int) -> int:
+        """Bit column_index (0 being the most significant) of report line index."""
+        return (self.value(index) >> (self.width - 1 - column_index)) & 1
+
+    def first_one(self, column_index: int, start: int, end: int) -> int:
+        """Index of the first report line in [start, end) with a 1 at column_index, end if none does. The lines of the
+        range must be ordered by that bit, 0s first, as ranges of sorted lines sharing their first bits are."""
+        while start < end:
+            middle: int = (start + end) // 2
+            if self.bit(middle, column_index):
+                end = middle
+            else:
+                start = middle + 1
+
+        return start
+
+    def sorted(self) -> PackedDiagnosticValues:
+        """Report lines in increasing order. Lines sharing their first bits then form a contiguous range, split in
+        two by their next bit: the 0s first, then the 1s."""
+        if self.width <= MAXIMUM_INTEGER_WIDTH:
+            return PackedDiagnosticValues(packed_values=sort(self.packed_values), width=self.width)
+
+        # Big-endian bytes: lexicographic order is numeric order, the first byte being the primary key.
+        return PackedDiagnosticValues(packed_values=self.packed_values[lexsort(self.packed_values.T[::-1])], width=self.width)
+
+    def value(self, index: int) -> int:
+        if self.width <= MAXIMUM_INTEGER_WIDTH:
+            return int(self.packed_values[index])
+
+        return int.from_bytes(self.packed_values[index].tobytes(), "big") >> (8 * self.packed_values.shape[1] - self.width)
+
+    @staticmethod
+    def pack(diagnostic_values: array) -> PackedDiagnosticValues:
+        """Packs a (report lines, width) array of bits, one shift-or pass per bit position.
+
+        Args:
+            diagnostic_values (array): 0/1 digits of every report line."""
+        width: int = diagnostic_values.shape[1]
+
+        if width > MAXIMUM_INTEGER_WIDTH:
+            return PackedDiagnosticValues(packed_values=packbits(diagnostic_values.astype(bool), axis=1), width=width)
+
+        packed_values: array = zeros(diagnostic_values.shape[0], dtype=uint64)
+        for column_index in range(width):
+            packed_values <<= uint64(1)
+            packed_values |= diagnostic_values[:, column_index].astype(uint64)
+
+        return PackedDiagnosticValues(packed_values=packed_values, width=width)
 
 
 class DiagnosticReport(object):
     def __init__(self, diagnostic_values: array) -> None:
-        self.gamma_rate: int = DiagnosticReport.Calculation.gamma_rate(diagnostic_values=diagnostic_values)
-        self.epsilon_rate: int = DiagnosticReport.Calculation.epsilon_rate(diagnostic_values=diagnostic_values)
+        packed_values: PackedDiagnosticValues = PackedDiagnosticValues.pack(diagnostic_values=diagnostic_values)
+
+        self.gamma_rate: int = DiagnosticReport.Calculation.gamma_rate(diagnostic_values=packed_values)
+        self.epsilon_rate: int = DiagnosticReport.Calculation.epsilon_rate(gamma_rate=self.gamma_rate, width=packed_values.width)
         self.power_consuption: int = DiagnosticReport.Calculation.power_consumption(gamma_rate=self.gamma_rate,
                                                                                     epislon_rate=self.epsilon_rate)
-        self.oxygen_generator_rating: int = DiagnosticReport.Calculation.oxygen_generator_rating(diagnostic_values=diagnostic_values)
-        self.CO2_scrubber_rating: int = DiagnosticReport.Calculation.CO2_scrubber_rating(diagnostic_values=diagnostic_values)
+        # Both ratings search the same sorted lines.
+        sorted_values: PackedDiagnosticValues = packed_values.sorted()
+        self.oxygen_generator_rating: int = DiagnosticReport.Calculation.oxygen_generator_rating(sorted_values=sorted_values)
+        self.CO2_scrubber_rating: int = DiagnosticReport.Calculation.CO2_scrubber_rating(sorted_values=sorted_values)
         self.life_support_rating: int = DiagnosticReport.Calculation.life_support_rating(oxygen_generator_rating=self.oxygen_generator_rating,
                                                                                          CO2_scrubber_rating=self.CO2_scrubber_rating)
 
@@ -36,94 +123,188 @@ class DiagnosticReport(object):
 
     class Calculation:
         @staticmethod
-        def gamma_rate(diagnostic_values: array) -> int:
-            diagnostic_values_mode = mode(diagnostic_values, axis=0).mode[0]
-            return int("".join([str(value) for value in diagnostic_values_mode]), 2)
+        @instrument()
+        def gamma_rate(diagnostic_values: PackedDiagnosticValues) -> int:
+            """Each bit of the gamma rate is the most common bit in that position, a tie counting as a 0."""
+            most_common_ones: array = flatnonzero(2 * diagnostic_values.column_one_counts() > len(diagnostic_values))
+            return sum(1 << (diagnostic_values.width - 1 - int(column_index)) for column_index in most_common_ones)
 
         @staticmethod
-        def oxygen_generator_rating(diagnostic_values: array) -> int:
+        def rating(sorted_values: PackedDiagnosticValues, keep_most_common: bool) -> int:
+            """Keeps the report lines with the most (or least) common bit in each position in turn until one is left.
+            Positions where every remaining line has the same bit keep them all.
+
+            The remaining lines are always a range [start, end) of the sorted lines, narrowed at each position by
+            binary searching its first 1. Nothing is copied and each position costs O(log lines)."""
+            start, end = 0, len(sorted_values)
+
+            for column_index in range(sorted_values.width):
+                if end - start == 1:
+                    break
+
+                first_one: int = sorted_values.first_one(column_index=column_index, start=start, end=end)
+                ones: int = end - first_one
+                if ones == 0 or ones == end - start:
+                    continue
+
+                # Ties keep the 1s for the most common bit and the 0s for the least common one.
+                ones_most_common: bool = 2 * ones >= end - start
+                start, end = (first_one, end) if ones_most_common == keep_most_common else (start, first_one)
+
+            return sorted_values.value(start)
+
+        @staticmethod
+        @instrument()
+        def oxygen_generator_rating(sorted_values: PackedDiagnosticValues) -> int:
             """To find oxygen generator rating, determine the most common value (0 or 1) in the current bit position, 
             and keep only numbers with that bit in that position. If 0 and 1 are equally common, keep values with a 1 
             in the position being considered."""
-            def trim_values(trimmed_values: array, column_index: int) -> array:
-                if (trimmed_values == trimmed_values[0]).all():
-                    return trimmed_values[0, :]
-                else:
-                    mode_analysis: ModeResult = mode(trimmed_values, axis=0)
-                    trimmed_values_mode: array = mode_analysis.mode[0]
-                    trimmed_values_count: array = mode_analysis.count[0]
-
-                    if trimmed_values_count[column_index] == trimmed_values.shape[0]/2:
-                        # Tie breaker
-                        column_mode: int = 1
-                    else:
-                        column_mode: int = trimmed_values_mode[column_index]
-
-                    return trim_values(trimmed_values=trimmed_values[trimmed_values[:, column_index] == column_mode], 
-                                       column_index=column_index+1)
-            solution_row: array = trim_values(trimmed_values=diagnostic_values, column_index=0)
-            return int("".join([str(value) for value in solution_row]), 2)
+            return DiagnosticReport.Calculation.rating(sorted_values=sorted_values, keep_most_common=True)
 
         @staticmethod
-        def CO2_scrubber_rating(diagnostic_values: array) -> int:
+        @instrument()
+        def CO2_scrubber_rating(sorted_values: PackedDiagnosticValues) -> int:
             """To find CO2 scrubber rating, determine the least common value (0 or 1) in the current bit position, 
             and keep only numbers with that bit in that position. If 0 and 1 are equally common, keep values with
              a 0 in the position being considered."""
-            def trim_values(trimmed_values: array, column_index: int) -> array:
-                if (trimmed_values == trimmed_values[0]).all():
-                    return trimmed_values[0, :]
-                else:
-                    mode_analysis: ModeResult = mode(trimmed_values, axis=0)
-                    trimmed_values_mode: array = mode_analysis.mode[0]
-                    trimmed_values_count: array = mode_analysis.count[0]
-
-                    if trimmed_values_count[column_index] == trimmed_values.shape[0]/2:
-                        # Tie breaker
-                        column_mode: int = 0
-                    else:
-                        column_mode: int = int(inverse_binary_string(str(trimmed_values_mode[column_index])))
-
-                    return trim_values(trimmed_values=trimmed_values[trimmed_values[:, column_index] == column_mode], 
-                                       column_index=column_index+1)
-            solution_row: array = trim_values(trimmed_values=diagnostic_values, column_index=0)
-            return int("".join([str(value) for value in solution_row]), 2)
+            return DiagnosticReport.Calculation.rating(sorted_values=sorted_values, keep_most_common=False)
 
         @staticmethod
         def life_support_rating(CO2_scrubber_rating: int, oxygen_generator_rating: int) -> int:
             return CO2_scrubber_rating * oxygen_generator_rating
 
         @staticmethod
-        def epsilon_rate(diagnostic_values: array) -> int:
-            diagnostic_values_mode = mode(diagnostic_values, axis=0).mode[0]
-            return int(inverse_binary_string("".join([str(value) for value in diagnostic_values_mode])), 2)
+        def epsilon_rate(gamma_rate: int, width: int) -> int:
+            """The least common bits are the complement of the most common ones."""
+            return gamma_rate ^ ((1 << width) - 1)
 
         @staticmethod
         def power_consumption(gamma_rate: int, epislon_rate: int) -> int:
             return gamma_rate * epislon_rate
 
     @staticmethod
+    @instrument()
     def load(diagnostic_report_file_path: str) -> DiagnosticReport:
         assert isfile(diagnostic_report_file_path), f"File not found: {diagnostic_report_file_path}"
-        diagnostic_values: List[array] = []
 
-        with open(diagnostic_report_file_path) as diagnostic_report_file:
-            for file_line in diagnostic_report_file.readlines():
-                report_line: array = array([int(value) for value in file_line if value != "\n"])
-                diagnostic_values.append(report_line)
+        return DiagnosticReport(diagnostic_values=load_snapshot(diagnostic_report_file_path, "digit_grid", load_digit_grid))
 
-        return DiagnosticReport(diagnostic_values=array(diagnostic_values))
 
+class IncrementalDiagnosticReport(object):
+    # Child index of a trie node without that child.
+    NO_CHILD: int = 0
 
-def inverse_binary_string(binary_string: str) -> str:
-    inverse: str = ""
+    def __init__(self, width: int) -> None:
+        """Constructor. Diagnostic report whose readings can be added and removed in O(width), every rating staying
+        queryable without a recompute. Per-column one counts give the gamma and epsilon rates. A binary trie over the
+        readings, each node counting the readings below it, gives the oxygen generator and CO2 scrubber ratings by
+        a single walk from the root.
 
-    for value in binary_string:
-        if value == "0":
-            inverse += "1"
-        else:
-            inverse += "0"
+        Args:
+            width (int): Bits per reading."""
+        self.width: int = width
+        self.column_one_counts: List[int] = [0] * width
+        # Node 0 is the root, children[node] holds the nodes of the next bit being 0 and 1.
+        self.children: List[List[int]] = [[IncrementalDiagnosticReport.NO_CHILD, IncrementalDiagnosticReport.NO_CHILD]]
+        self.counts: List[int] = [0]
+
+    def __len__(self) -> int:
+        return self.counts[0]
+
+    def __str__(self) -> str:
+        return str({"readings": len(self),
+                    "gamma_rate": self.gamma_rate(),
+                    "epsilon_rate": self.epsilon_rate(),
+                    "oxygen_generator_rating": self.oxygen_generator_rating(),
+                    "CO2_scrubber_rating": self.CO2_scrubber_rating()})
+
+    def add(self, reading: int) -> None:
+        assert 0 <= reading < 1 << self.width, f"Reading {reading} does not fit in {self.width} bits"
+        node: int = 0
+        self.counts[node] += 1
+
+        for column_index in range(self.width):
+            bit: int = (reading >> (self.width - 1 - column_index)) & 1
+            self.column_one_counts[column_index] += bit
+
+            if self.children[node][bit] == IncrementalDiagnosticReport.NO_CHILD:
+                self.children[node][bit] = len(self.counts)
+                self.children.append([IncrementalDiagnosticReport.NO_CHILD, IncrementalDiagnosticReport.NO_CHILD])
+                self.counts.append(0)
+
+            node = self.children[node][bit]
+            self.counts[node] += 1
+
+    def extend(self, readings: Iterable[int]) -> None:
+        for reading in readings:
+            self.add(reading)
+
+    def remove(self, reading: int) -> None:
+        """Removes one occurrence of reading. Emptied trie nodes are kept for the readings added later."""
+        nodes: List[int] = [0]
+        for column_index in range(self.width):
+            nodes.append(self.children[nodes[-1]][(reading >> (self.width - 1 - column_index)) & 1])
+            assert nodes[-1] != IncrementalDiagnosticReport.NO_CHILD and self.counts[nodes[-1]] > 0, f"Reading {reading} is not in the report"
+
+        for node in nodes:
+            self.counts[node] -= 1
+        for column_index in range(self.width):
+            self.column_one_counts[column_index] -= (reading >> (self.width - 1 - column_index)) & 1
+
+    def gamma_rate(self) -> int:
+        """Each bit of the gamma rate is the most common bit in that position, a tie counting as a 0."""
+        return sum(1 << (self.width - 1 - column_index) for column_index, ones in enumerate(self.column_one_counts)
+                   if 2 * ones > len(self))
+
+    def epsilon_rate(self) -> int:
+        return DiagnosticReport.Calculation.epsilon_rate(gamma_rate=self.gamma_rate(), width=self.width)
+
+    def power_consumption(self) -> int:
+        return self.gamma_rate() * self.epsilon_rate()
+
+    def rating(self, keep_most_common: bool) -> int:
+        """Walks the trie keeping the most (or least) common next bit among the readings below the current node, the
+        same rule as DiagnosticReport.Calculation.rating. Once one reading is left its only path is followed."""
+        assert len(self) > 0, "The report holds no readings"
+        node: int = 0
+        rating: int = 0
+
+        for _ in range(self.width):
+            zeros_node, ones_node = self.children[node]
+            zeros: int = self.counts[zeros_node] if zeros_node != IncrementalDiagnosticReport.NO_CHILD else 0
+            ones: int = self.counts[ones_node] if ones_node != IncrementalDiagnosticReport.NO_CHILD else 0
+
+            if zeros == 0 or ones == 0:
+                bit: int = int(ones > 0)
+            else:
+                # Ties keep the 1s for the most common bit and the 0s for the least common one.
+                bit = int((2 * ones >= zeros + ones) == keep_most_common)
+
+            rating = rating << 1 | bit
+            node = self.children[node][bit]
+
+        return rating
+
+    def oxygen_generator_rating(self) -> int:
+        return self.rating(keep_most_common=True)
+
+    def CO2_scrubber_rating(self) -> int:
+        return self.rating(keep_most_common=False)
+
+    def life_support_rating(self) -> int:
+        return self.oxygen_generator_rating() * self.CO2_scrubber_rating()
+
+    @staticmethod
+    @instrument()
+    def load(diagnostic_report_file_path: str) -> IncrementalDiagnosticReport:
+        assert isfile(diagnostic_report_file_path), f"File not found: {diagnostic_report_file_path}"
+        packed_values: PackedDiagnosticValues = PackedDiagnosticValues.pack(
+            diagnostic_values=load_snapshot(diagnostic_report_file_path, "digit_grid", load_digit_grid))
+
+        incremental_diagnostic_report: IncrementalDiagnosticReport = IncrementalDiagnosticReport(width=packed_values.width)
+        incremental_diagnostic_report.extend(packed_values.value(index) for index in range(len(packed_values)))
+        return incremental_diagnostic_report
 
-    return inverse
 
 class Examples(TestCase):
     def test_part_one_example(self) -> None:
@@ -139,28 +320,93 @@ class Examples(TestCase):
     def test_part_two_example(self) -> None:
         print(f"\nPerforming unittest: {Examples.test_part_two_example}")
 
-        diagnostic_report: DiagnosticReport = DiagnosticReport.load(diagnostirc_report_file_path=join(dirname(__file__), "example.txt"))
+        diagnostic_report: DiagnosticReport = DiagnosticReport.load(diagnostic_report_file_path=join(dirname(__file__), "example.txt"))
         self.assertEqual(diagnostic_report.oxygen_generator_rating, 23)
         self.assertEqual(diagnostic_report.CO2_scrubber_rating, 10)
         self.assertEqual(diagnostic_report.life_support_rating, 230)
 
         print(f"Unittest {Examples.test_part_two_example} was successful.")
 
+    def test_packed_diagnostic_values(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_packed_diagnostic_values}")
+
+        # Widths on both sides of the single integer packing.
+        for width in [5, 64, 65, 100]:
+            diagnostic_values: array = default_rng(width).integers(0, 2, size=(501, width), dtype=uint8)
+            packed_values: PackedDiagnosticValues = PackedDiagnosticValues.pack(diagnostic_values=diagnostic_values)
+
+            self.assertEqual(packed_values.column_one_counts().tolist(), diagnostic_values.sum(axis=0).tolist())
+            self.assertEqual(packed_values.value(7), int("".join(str(bit) for bit in diagnostic_values[7]), 2))
+            gamma_rate: int = DiagnosticReport.Calculation.gamma_rate(diagnostic_values=packed_values)
+            self.assertEqual(gamma_rate, int("".join(str(int(2 * ones > 501)) for ones in diagnostic_values.sum(axis=0)), 2))
+            self.assertEqual(gamma_rate + DiagnosticReport.Calculation.epsilon_rate(gamma_rate=gamma_rate, width=width), 2 ** width - 1)
+
+            sorted_values: PackedDiagnosticValues = packed_values.sorted()
+            self.assertEqual([sorted_values.value(index) for index in range(501)],
+                             sorted(packed_values.value(index) for index in range(501)))
+            for keep_most_common in [True, False]:
+                remaining_lines: List[str] = ["".join(str(bit) for bit in line) for line in diagnostic_values.tolist()]
+                for column_index in range(width):
+                    ones: int = sum(line[column_index] == "1" for line in remaining_lines)
+                    if len(remaining_lines) > 1 and 0 < ones < len(remaining_lines):
+                        kept_bit: str = "1" if (2 * ones >= len(remaining_lines)) == keep_most_common else "0"
+                        remaining_lines = [line for line in remaining_lines if line[column_index] == kept_bit]
+                self.assertEqual(DiagnosticReport.Calculation.rating(sorted_values=sorted_values, keep_most_common=keep_most_common),
+                                 int(remaining_lines[0], 2))
+
+        print(f"Unittest {Examples.test_packed_diagnostic_values} was successful.")
+
+    def test_incremental_diagnostic_report(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_incremental_diagnostic_report}")
+        example_file_path: str = join(dirname(__file__), "example.txt")
+
+        incremental_diagnostic_report: IncrementalDiagnosticReport = IncrementalDiagnosticReport.load(diagnostic_report_file_path=example_file_path)
+        self.assertEqual(incremental_diagnostic_report.power_consumption(), 198)
+        self.assertEqual(incremental_diagnostic_report.oxygen_generator_rating(), 23)
+        self.assertEqual(incremental_diagnostic_report.CO2_scrubber_rating(), 10)
+
+        # Expiring readings one by one matches a report rebuilt from the remaining ones.
+        with open(example_file_path) as example_file:
+            readings: List[int] = [int(line, 2) for line in example_file.read().split()]
+        for expired in range(len(readings) - 1):
+            incremental_diagnostic_report.remove(readings[expired])
+            diagnostic_report: DiagnosticReport = DiagnosticReport(diagnostic_values=array(
+                [[int(bit) for bit in f"{reading:05b}"] for reading in readings[expired + 1:]], dtype=uint8))
+            self.assertEqual(incremental_diagnostic_report.power_consumption(), diagnostic_report.power_consuption)
+            self.assertEqual(incremental_diagnostic_report.life_support_rating(), diagnostic_report.life_support_rating)
+
+        incremental_diagnostic_report.extend(readings[:-1])
+        self.assertEqual(incremental_diagnostic_report.life_support_rating(), 230)
+        with self.assertRaises(AssertionError):
+            IncrementalDiagnosticReport(width=5).remove(readings[0])
+
+        print(f"Unittest {Examples.test_incremental_diagnostic_report} was successful.")
+
 class Solutions(TestCase):
     pass
     def test_part_one(self) -> None:
         print(f"\nCalculating solution to {Solutions.test_part_one}")
 
-        diagnostic_report: DiagnosticReport = DiagnosticReport.load(diagnostirc_report_file_path=join(dirname(__file__), "input.txt"))
+        diagnostic_report: DiagnosticReport = DiagnosticReport.load(diagnostic_report_file_path=join(dirname(__file__), "input.txt"))
 
         print(f"Part one solution calculated to be: {diagnostic_report.power_consuption}.")
 
     def test_part_two(self) -> None:
         print(f"\nCalculating solution to {Solutions.test_part_two}")
 
-        diagnostic_report: DiagnosticReport = DiagnosticReport.load(diagnostirc_report_file_path=join(dirname(__file__), "input.txt"))
+        diagnostic_report: DiagnosticReport = DiagnosticReport.load(diagnostic_report_file_path=join(dirname(__file__), "input.txt"))
 
         print(f"Part two solution calculated to be: {diagnostic_report.life_support_rating}.")
 
+    def test_incremental_diagnostic_report(self) -> None:
+        print(f"\nCalculating solution to {Solutions.test_incremental_diagnostic_report}")
+
+        diagnostic_report: DiagnosticReport = DiagnosticReport.load(diagnostic_report_file_path=join(dirname(__file__), "input.txt"))
+        incremental_diagnostic_report: IncrementalDiagnosticReport = IncrementalDiagnosticReport.load(diagnostic_report_file_path=join(dirname(__file__), "input.txt"))
+        self.assertEqual(incremental_diagnostic_report.power_consumption(), diagnostic_report.power_consuption)
+        self.assertEqual(incremental_diagnostic_report.life_support_rating(), diagnostic_report.life_support_rating)
+
+        print(f"Unittest {Solutions.test_incremental_diagnostic_report} was successful.")
+
 if __name__ == "__main__":
     main()
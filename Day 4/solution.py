@@ -6,12 +6,35 @@ __email__ = "jacobtaylorcassady@outlook.com"
 
 # Built-in modules
 from unittest import TestCase, main
-from os.path import isfile, join, dirname
-from typing import List, Union, Tuple
+from os import cpu_count
+from tempfile import TemporaryDirectory
+from os.path import isfile, join, dirname, abspath
+from sys import path as system_path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 from enum import unique, Enum
 
 # 3rd Party modules
-from numpy import array, zeros, alltrue, apply_along_axis, fliplr, any, where
+from numpy import array, zeros, where, stack, argsort, bincount, cumsum, \
+    concatenate, add, int32, int64, min_scalar_type, unique as unique_values, full, arange, minimum, column_stack, \
+    flatnonzero
+
+# concurrent.futures and multiprocessing only serve process pools, they are imported where a pool starts to keep startup fast.
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.instrumentation import instrument
+from common.days import SolutionFunction
+from common.loader import NEWLINE, map_file, decode_integers
+
+DAY: int = 4
+REPOSITORY_DIRECTORY: str = dirname(dirname(abspath(__file__)))
+# Sequences handed to a pool worker at once by BingoEngine.evaluate, per worker.
+CHUNKS_PER_WORKER: int = 4
+# Boards yielded at once by BingoSubsystem.iterate_board_blocks, and bytes of the board section decoded at once.
+BOARD_BLOCK_SIZE: int = 65536
+BOARD_CHUNK_BYTES: int = 16 * 1024 * 1024
 
 @unique
 class PART(Enum):
@@ -19,94 +42,396 @@ class PART(Enum):
     TWO: str = "two"
 
 class BingoBoard(object):
-    def __init__(self, puzzle_values: array) -> None:
+    def __init__(self, puzzle_values: array, diagonals: bool = False) -> None:
+        """Constructor. Marked cells are counted per row, column and diagonal, so marking a draw and checking for a win
+        cost the same whatever the board size.
+
+        Args:
+            puzzle_values (array): Numbers of the board, shape (puzzle size, puzzle size).
+            diagonals (bool, optional): Whether a fully marked diagonal wins too. Defaults to False."""
         self.puzzle_values: array = puzzle_values
-        self.puzzle_states: array = zeros(puzzle_values.shape, dtype=bool)
+        self.diagonals: bool = diagonals
+        self.puzzle_size: int = puzzle_values.shape[0]
+        # Cells holding each number, built once.
+        self.cells_by_value: Dict[int, List[Tuple[int, int]]] = {}
+        for row, row_values in enumerate(puzzle_values.tolist()):
+            for column, value in enumerate(row_values):
+                self.cells_by_value.setdefault(value, []).append((row, column))
+        self.reset()
 
     def __str__(self) -> str:
         return str({"values": self.puzzle_values, 
                     "states": self.puzzle_states})
-    
+
+    def reset(self) -> None:
+        """Unmarks every cell."""
+        self.puzzle_states: array = zeros(self.puzzle_values.shape, dtype=bool)
+        self.row_hits: List[int] = [0] * self.puzzle_size
+        self.column_hits: List[int] = [0] * self.puzzle_size
+        # Main diagonal, then anti-diagonal.
+        self.diagonal_hits: List[int] = [0, 0]
+        self.won: bool = False
+
+    @instrument()
     def check_draw(self, draw: int) -> bool:
-        draw_index: array = where(self.puzzle_values == draw)
+        """Marks the cells holding draw.
 
-        if len(draw_index[0]) > 0:
-            row: int = draw_index[0]
-            column: int = draw_index[1]
+        Returns:
+            bool: Whether draw is on the board."""
+        cells: Optional[List[Tuple[int, int]]] = self.cells_by_value.get(draw)
+
+        if cells is None:
+            return False
+
+        for row, column in cells:
+            if self.puzzle_states[row, column]:
+                continue
 
             self.puzzle_states[row, column] = True
+            self.row_hits[row] += 1
+            self.column_hits[column] += 1
+            self.won |= self.row_hits[row] == self.puzzle_size or self.column_hits[column] == self.puzzle_size
 
-    def is_winner(self) -> bool:
-        checks: array = array([
-            # row check
-            any(apply_along_axis(alltrue, axis=1, arr=self.puzzle_states)),
-            # column check
-            any(apply_along_axis(alltrue, axis=0, arr=self.puzzle_states))])
-            # diagnal check
-            #alltrue(self.puzzle_states.diagonal()),
-            #alltrue(fliplr(self.puzzle_states).diagonal()])
+            if self.diagonals:
+                if row == column:
+                    self.diagonal_hits[0] += 1
+                    self.won |= self.diagonal_hits[0] == self.puzzle_size
+                if row + column == self.puzzle_size - 1:
+                    self.diagonal_hits[1] += 1
+                    self.won |= self.diagonal_hits[1] == self.puzzle_size
 
-        return any(checks)
+        return True
+
+    def is_winner(self) -> bool:
+        return self.won
 
     def score(self, winning_draw: int) -> int:
         return self.puzzle_values[~self.puzzle_states].sum() * winning_draw
 
 
+class BingoEngine(object):
+    # Columns of the ranking table.
+    BOARD, DRAW_INDEX, DRAW, SCORE = range(4)
+
+    def __init__(self, boards: array, diagonals: bool = False) -> None:
+        """Constructor. Plays every board at once. The boards are stacked in the smallest unsigned dtype holding their
+        numbers (uint8 for the puzzle's 0-99) and indexed by number, so a draw only touches the cells holding it.
+
+        Args:
+            boards (array): Numbers of every board, shape (boards, puzzle size, puzzle size).
+            diagonals (bool, optional): Whether a fully marked diagonal wins too, as for BingoBoard. Defaults to False."""
+        self.diagonals: bool = diagonals
+        assert boards.size == 0 or boards.min() >= 0, "Bingo numbers must not be negative"
+        # Without boards, uint8 like the puzzle's.
+        self.boards: array = boards.astype(min_scalar_type(int(boards.max()) if boards.size > 0 else 0), copy=False)
+        self.puzzle_size: int = boards.shape[1]
+        flat_values: array = self.boards.reshape(-1)
+        # Inverted index: cells_by_value[value_offsets[value]:value_offsets[value + 1]] are the flat indices of the
+        # cells holding value.
+        self.cells_by_value: array = argsort(flat_values, kind="stable")
+        self.value_offsets: array = concatenate([zeros(1, dtype=int64), cumsum(bincount(flat_values))])
+
+    def __len__(self) -> int:
+        return self.boards.shape[0]
+
+    def cells(self, value: int) -> array:
+        if not 0 <= value < len(self.value_offsets) - 1:
+            return zeros(0, dtype=int64)
+
+        return self.cells_by_value[self.value_offsets[value]:self.value_offsets[value + 1]]
+
+    @instrument()
+    def play(self, draw_order: array) -> Iterator[Tuple[int, int, int]]:
+        """Draws the numbers in order, keeping per board row, column and, with diagonals, diagonal hit counters: a mark
+        completes a line when its counter reaches the puzzle size, an O(1) check. The boards themselves are never
+        modified.
+
+        Yields:
+            Iterator[Tuple[int, int, int]]: (board index, draw index, score) of each board as it wins. Boards winning
+                on the same draw come in board order."""
+        board_count, puzzle_size = len(self), self.puzzle_size
+        marked: array = zeros(self.boards.size, dtype=bool)
+        row_hits: array = zeros((board_count, puzzle_size), dtype=int32)
+        column_hits: array = zeros((board_count, puzzle_size), dtype=int32)
+        # Main diagonal, then anti-diagonal.
+        diagonal_hits: array = zeros((board_count, 2), dtype=int32)
+        won: array = zeros(board_count, dtype=bool)
+
+        for draw_index, draw in enumerate(draw_order.tolist()):
+            cells: array = self.cells(draw)
+            # A number drawn twice marks nothing new.
+            cells = cells[~marked[cells]]
+            if len(cells) == 0:
+                continue
+
+            marked[cells] = True
+            hit_boards, board_cells = divmod(cells, puzzle_size * puzzle_size)
+            hit_rows, hit_columns = divmod(board_cells, puzzle_size)
+            add.at(row_hits, (hit_boards, hit_rows), 1)
+            add.at(column_hits, (hit_boards, hit_columns), 1)
+
+            completed: array = (row_hits[hit_boards, hit_rows] == puzzle_size) | (column_hits[hit_boards, hit_columns] == puzzle_size)
+
+            if self.diagonals:
+                for diagonal, on_diagonal in enumerate((hit_rows == hit_columns, hit_rows + hit_columns == puzzle_size - 1)):
+                    add.at(diagonal_hits, (hit_boards[on_diagonal], diagonal), 1)
+                    completed |= on_diagonal & (diagonal_hits[hit_boards, diagonal] == puzzle_size)
+            winners: array = unique_values(hit_boards[completed & ~won[hit_boards]])
+            if len(winners) == 0:
+                continue
+
+            won[winners] = True
+            unmarked_sums: array = where(marked.reshape(self.boards.shape)[winners], 0, self.boards[winners]).sum(axis=(1, 2), dtype=int64)
+            for winner, unmarked_sum in zip(winners.tolist(), unmarked_sums.tolist()):
+                yield winner, draw_index, unmarked_sum * draw
+
+
+    @instrument()
+    def ranking(self, draw_order: array) -> array:
+        """Order in which every board wins, in closed form: with each cell holding the draw index of its number, a
+        line (row, column and, with diagonals, diagonal) completes at the largest index along it and a board wins at the
+        smallest of its lines' completions.
+
+        Returns:
+            array: int64 table with one row per board, columns BOARD, DRAW_INDEX, DRAW and SCORE, in winning order
+                (board order for boards winning on the same draw). Boards that never win come last with a DRAW_INDEX
+                and DRAW of -1 and a SCORE of 0."""
+        never: int = len(draw_order)
+        # Draw index of each number's first draw. Numbers never drawn, or not on any board, rank after every draw.
+        number_ranks: array = full(len(self.value_offsets) - 1, never, dtype=min_scalar_type(never))
+        on_boards: array = (draw_order >= 0) & (draw_order < len(number_ranks))
+        drawn_numbers, first_draws = unique_values(draw_order[on_boards], return_index=True)
+        number_ranks[drawn_numbers] = arange(never)[on_boards][first_draws]
+
+        cell_ranks: array = number_ranks[self.boards]
+        win_ranks: array = minimum(cell_ranks.max(axis=2).min(axis=1), cell_ranks.max(axis=1).min(axis=1)).astype(int64)
+
+        if self.diagonals:
+            steps: array = arange(self.puzzle_size)
+            win_ranks = minimum(win_ranks, minimum(cell_ranks[:, steps, steps].max(axis=1),
+                                                   cell_ranks[:, steps, self.puzzle_size - 1 - steps].max(axis=1)))
+        unmarked_sums: array = where(cell_ranks > win_ranks[:, None, None], self.boards, 0).sum(axis=(1, 2), dtype=int64)
+
+        won: array = win_ranks < never
+        winning_draws: array = where(won, draw_order[minimum(win_ranks, never - 1)] if never > 0 else -1, -1)
+        board_order: array = argsort(win_ranks, kind="stable")
+        return column_stack([board_order, where(won, win_ranks, -1)[board_order], winning_draws[board_order],
+                             where(won, unmarked_sums * winning_draws, 0)[board_order]]).astype(int64)
+
+    def first_and_last_wins(self, draw_orders: array) -> Tuple[array, array]:
+        """First and last win of every draw order, ranked in this process.
+
+        Args:
+            draw_orders (array): One draw order per row, shape (sequences, draws).
+
+        Returns:
+            Tuple[array, array]: int64 BOARD, DRAW, SCORE rows of the first and of the last winner of each sequence.
+                As in BingoSubsystem.run, a sequence has a last winner only when every board wins. Missing winners
+                are (-1, -1, 0) rows."""
+        columns: List[int] = [BingoEngine.BOARD, BingoEngine.DRAW, BingoEngine.SCORE]
+        first_wins: array = full((len(draw_orders), 3), -1, dtype=int64)
+        first_wins[:, 2] = 0
+        last_wins: array = first_wins.copy()
+
+        for sequence, draw_order in enumerate(draw_orders):
+            ranking: array = self.ranking(draw_order=draw_order)
+
+            if len(ranking) == 0:
+                continue
+
+            first_wins[sequence], last_wins[sequence] = ranking[0, columns], ranking[-1, columns]
+
+        # Boards that never win keep their index in the ranking, hide it.
+        first_wins[first_wins[:, 1] == -1, 0] = -1
+        last_wins[last_wins[:, 1] == -1, 0] = -1
+        return first_wins, last_wins
+
+    @instrument()
+    def evaluate(self, draw_orders: array, workers: Optional[int] = None, mp_context: Optional[BaseContext] = None) -> Tuple[array, array]:
+        """First and last win of many draw orders against these boards, ranked in a process pool. Each worker indexes
+        the boards once and ranks whole chunks of sequences, nothing shared is modified.
+
+        Args:
+            draw_orders (array): One draw order per row, shape (sequences, draws).
+            workers (Optional[int], optional): Process count, 1 ranks the sequences in this process. Defaults to one
+                per core.
+            mp_context (Optional[BaseContext], optional): Start method of the workers. Defaults to the platform's.
+
+        Returns:
+            Tuple[array, array]: See first_and_last_wins."""
+        assert draw_orders.ndim == 2, "Draw orders must be a 2D array of one sequence per row"
+        workers = workers or cpu_count()
+
+        if workers == 1 or len(draw_orders) < 2:
+            return self.first_and_last_wins(draw_orders=draw_orders)
+
+        chunk_size: int = -(-len(draw_orders) // (CHUNKS_PER_WORKER * workers))
+        chunks: List[array] = [draw_orders[start:start + chunk_size] for start in range(0, len(draw_orders), chunk_size)]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        # The workers reach this module through its file, it may not be importable by name in a spawned process.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                 initializer=SolutionFunction(day=DAY, function_name="_initialize_worker_engine", repository_directory=REPOSITORY_DIRECTORY),
+                                 initargs=(self.boards, self.diagonals)) as executor:
+            chunk_wins: List[Tuple[array, array]] = list(executor.map(
+                SolutionFunction(day=DAY, function_name="_first_and_last_wins", repository_directory=REPOSITORY_DIRECTORY), chunks))
+
+        return concatenate([first_wins for first_wins, _ in chunk_wins]), concatenate([last_wins for _, last_wins in chunk_wins])
+
+# Engine of the current pool worker, built once by _initialize_worker_engine.
+_WORKER_ENGINE: Optional[BingoEngine] = None
+
+def _initialize_worker_engine(boards: array, diagonals: bool) -> None:
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = BingoEngine(boards=boards, diagonals=diagonals)
+
+def _first_and_last_wins(draw_orders: array) -> Tuple[array, array]:
+    return _WORKER_ENGINE.first_and_last_wins(draw_orders=draw_orders)
+
+
 class BingoSubsystem(object):
-    def __init__(self, draw_order: array, bingo_boards: List[BingoBoard]) -> None:
+    def __init__(self, draw_order: array, bingo_boards: Optional[List[BingoBoard]] = None, boards: Optional[array] = None,
+                 diagonals: bool = False) -> None:
+        """Constructor. Give either the boards or their stacked numbers.
+
+        Args:
+            draw_order (array): Numbers in the order they are drawn.
+            bingo_boards (Optional[List[BingoBoard]], optional): Boards played. Defaults to None.
+            boards (Optional[array], optional): Numbers of the boards stacked, shape (boards, puzzle size, puzzle size).
+                Defaults to stacking bingo_boards when the engine is first needed.
+            diagonals (bool, optional): Whether a fully marked diagonal wins too. Defaults to the boards' option, which
+                must be the same for all of them."""
+        assert bingo_boards is not None or boards is not None, "Bingo needs boards"
+        if bingo_boards:
+            assert len({bingo_board.diagonals for bingo_board in bingo_boards}) == 1, "Every board must play the same lines"
+            diagonals = diagonals or bingo_boards[0].diagonals
         self.draw_order: array = draw_order
-        self.bingo_boards: List[BingoBoard] = bingo_boards
-
+        self.diagonals: bool = diagonals
+        # Boards built so far by index, the engine plays from the stacked numbers and a board is only built to be
+        # returned by run.
+        self.built_boards: Dict[int, BingoBoard] = dict(enumerate(bingo_boards or []))
+        self.boards: Optional[array] = boards
+        self.bingo_engine: Optional[BingoEngine] = None
+
+    @property
+    def bingo_boards(self) -> List[BingoBoard]:
+        """Every board in order, building those not built yet."""
+        board_count: int = len(self.boards) if self.boards is not None else len(self.built_boards)
+        return [self.board(index) for index in range(board_count)]
+
+    def board(self, index: int) -> BingoBoard:
+        """Board at index, built on first use."""
+        if index not in self.built_boards:
+            self.built_boards[index] = BingoBoard(puzzle_values=self.boards[index], diagonals=self.diagonals)
+
+        return self.built_boards[index]
+
+    def engine(self) -> BingoEngine:
+        """Engine over the boards, built on first use."""
+        if self.bingo_engine is None:
+            if self.boards is None:
+                self.boards = stack([self.built_boards[index].puzzle_values for index in range(len(self.built_boards))])
+            self.bingo_engine = BingoEngine(boards=self.boards, diagonals=self.diagonals)
+
+        return self.bingo_engine
+
+    @instrument()
     def run(self, part: PART) -> Tuple[BingoBoard, int]:
-        if part == PART.ONE:
-            for draw in self.draw_order:
-                for bingo_board in self.bingo_boards:
-                    bingo_board.check_draw(draw=draw)
-                    if bingo_board.is_winner():
-                        return bingo_board, draw
+        """Part one returns the first board to win, part two the last one once every board has won.
+
+        Returns:
+            Tuple[BingoBoard, int]: The board, marked as it was when it won, and the winning draw. (None, None) when
+                no board wins, or for part two when some board never does."""
+        ranking: array = self.engine().ranking(draw_order=self.draw_order)
 
+        if len(ranking) == 0:
             return None, None
-        elif part == PART.TWO:
-            for draw in self.draw_order:
 
-                winning_boards: List[BingoBoard] = []
-                for bingo_board in self.bingo_boards:
-                    bingo_board.check_draw(draw=draw)
+        # Boards that never win rank last, part two needs the last board to have won too.
+        win: array = ranking[0] if part == PART.ONE else ranking[-1]
 
-                    if bingo_board.is_winner():
-                        winning_boards.append(bingo_board)
+        if win[BingoEngine.DRAW_INDEX] == -1:
+            return None, None
 
-                for winning_board in winning_boards:
-                    if len(self.bingo_boards) == 1:
-                        return self.bingo_boards[0], draw
-                    else:
-                        self.bingo_boards.remove(winning_board)
+        board_index, draw_index = int(win[BingoEngine.BOARD]), int(win[BingoEngine.DRAW_INDEX])
+        winning_board: BingoBoard = self.board(board_index)
+        winning_board.reset()
+        for draw in self.draw_order[:draw_index + 1].tolist():
+            winning_board.check_draw(draw)
+        return winning_board, self.draw_order[draw_index]
 
-            return None, None
+    @staticmethod
+    def line_end(buffer: array, position: int, chunk_bytes: int = BOARD_CHUNK_BYTES) -> int:
+        """Offset just past the first newline at or after position, the buffer length when there is none. The buffer is
+        searched chunk_bytes at a time so that a huge file is never compared whole."""
+        while position < len(buffer):
+            newlines: array = flatnonzero(buffer[position:position + chunk_bytes] == NEWLINE)
+
+            if len(newlines) > 0:
+                return position + int(newlines[0]) + 1
+            position += chunk_bytes
+
+        return len(buffer)
+
+    @staticmethod
+    @instrument()
+    def parse(puzzle_input_file_path: str, puzzle_size: int = 5) -> Tuple[array, array]:
+        """Parses the draw order line and decodes the whole board section at once, whatever blank lines separate the
+        boards or end the file.
+
+        Returns:
+            Tuple[array, array]: The draw order and the boards, shape (boards, puzzle_size, puzzle_size)."""
+        buffer: array = map_file(puzzle_input_file_path)
+        draw_order_end: int = BingoSubsystem.line_end(buffer, 0)
+        board_values: array = decode_integers(buffer[draw_order_end:])
+        assert len(board_values) % puzzle_size**2 == 0, f"Every board must hold {puzzle_size}x{puzzle_size} numbers"
+
+        return decode_integers(buffer[:draw_order_end]), board_values.reshape(-1, puzzle_size, puzzle_size)
+
+    @staticmethod
+    def iterate_board_blocks(puzzle_input_file_path: str, puzzle_size: int = 5, boards_per_block: int = BOARD_BLOCK_SIZE,
+                             chunk_bytes: int = BOARD_CHUNK_BYTES) -> Iterator[array]:
+        """Decodes the board section chunk_bytes at a time, cut on line ends, for files too large to hold every board.
+
+        Args:
+            puzzle_input_file_path (str): relative or absolute path to the puzzle input file.
+            puzzle_size (int, optional): Rows and columns of a board. Defaults to 5.
+            boards_per_block (int, optional): Boards per yielded block. Defaults to BOARD_BLOCK_SIZE.
+            chunk_bytes (int, optional): Bytes decoded at once. Defaults to BOARD_CHUNK_BYTES.
+
+        Returns:
+            Iterator[array]: Blocks of shape (boards_per_block, puzzle_size, puzzle_size) in file order, the last one
+                holding the remaining boards."""
+        buffer: array = map_file(puzzle_input_file_path)
+        block_values: int = boards_per_block * puzzle_size**2
+        pending: array = zeros(0, dtype=int32)
+        start: int = BingoSubsystem.line_end(buffer, 0, chunk_bytes=chunk_bytes)
+
+        while start < len(buffer):
+            # Cut after the last newline of the chunk so no number is split, or past the next one for a longer line.
+            newlines: array = flatnonzero(buffer[start:start + chunk_bytes] == NEWLINE)
+            stop: int = start + int(newlines[-1]) + 1 if len(newlines) > 0 and start + chunk_bytes < len(buffer) \
+                else BingoSubsystem.line_end(buffer, start + chunk_bytes, chunk_bytes=chunk_bytes)
+            pending = concatenate([pending, decode_integers(buffer[start:stop])])
+            start = stop
+
+            complete_values: int = len(pending) // block_values * block_values
+            for block_start in range(0, complete_values, block_values):
+                yield pending[block_start:block_start + block_values].reshape(-1, puzzle_size, puzzle_size)
+            pending = pending[complete_values:]
+
+        assert len(pending) % puzzle_size**2 == 0, f"Every board must hold {puzzle_size}x{puzzle_size} numbers"
+        if len(pending) > 0:
+            yield pending.reshape(-1, puzzle_size, puzzle_size)
 
     @staticmethod
-    def load(puzzle_input_file_path: str, puzzle_size: int = 5) -> BingoSubsystem:
+    @instrument()
+    def load(puzzle_input_file_path: str, puzzle_size: int = 5, diagonals: bool = False) -> BingoSubsystem:
         assert isfile(puzzle_input_file_path), f"File not found: {puzzle_input_file_path}"
+        draw_order, boards = BingoSubsystem.parse(puzzle_input_file_path, puzzle_size=puzzle_size)
 
-        with open(puzzle_input_file_path) as puzzle_input_file:
-            # Load draw order
-            draw_order: array = array([int(draw) for draw in puzzle_input_file.readline().split(",")])
-            # Read empty line
-            puzzle_input_file.readline()
-
-            bingo_boards: List[BingoBoard] = []
-            puzzle_line_count: int = 0
-            puzzle_values: Union[List[array], array] = []
-            for line in puzzle_input_file:
-                if puzzle_line_count < puzzle_size:
-                    puzzle_values.append(array([int(value) for value in line.split(" ") if value != ""]))
-                    puzzle_line_count += 1
-                else:
-                    bingo_boards.append(BingoBoard(puzzle_values=array(puzzle_values)))
-                    puzzle_line_count = 0
-                    puzzle_values: Union[List[array], array] = []
-            else:
-                return BingoSubsystem(draw_order=draw_order, bingo_boards=bingo_boards)
+        return BingoSubsystem(draw_order=draw_order, boards=boards, diagonals=diagonals)
 
 
 class Examples(TestCase):
@@ -132,6 +457,167 @@ class Examples(TestCase):
 
         print(f"Unittest {Examples.test_part_two_example} was successful.")
 
+    def test_bingo_engine_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_bingo_engine_example}")
+
+        bingo_subsystem: BingoSubsystem = BingoSubsystem.load(puzzle_input_file_path=join(dirname(__file__), "example.txt"))
+        self.assertEqual(bingo_subsystem.engine().boards.dtype, min_scalar_type(99))
+
+        # Board 3 wins on 24, then board 1 on 16 and board 2 on 13.
+        wins: List[Tuple[int, int, int]] = list(bingo_subsystem.engine().play(draw_order=bingo_subsystem.draw_order))
+        self.assertEqual([(board_index, int(bingo_subsystem.draw_order[draw_index]), score) for board_index, draw_index, score in wins],
+                         [(2, 24, 4512), (0, 16, 2192), (1, 13, 1924)])
+        # Playing leaves the engine untouched, a second game gives the same wins.
+        self.assertEqual(list(bingo_subsystem.engine().play(draw_order=bingo_subsystem.draw_order)), wins)
+
+        print(f"Unittest {Examples.test_bingo_engine_example} was successful.")
+
+    def test_ranking_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_ranking_example}")
+
+        bingo_subsystem: BingoSubsystem = BingoSubsystem.load(puzzle_input_file_path=join(dirname(__file__), "example.txt"))
+        bingo_engine: BingoEngine = bingo_subsystem.engine()
+        ranking: array = bingo_engine.ranking(draw_order=bingo_subsystem.draw_order)
+        self.assertEqual(ranking[:, [BingoEngine.BOARD, BingoEngine.DRAW, BingoEngine.SCORE]].tolist(),
+                         [[2, 24, 4512], [0, 16, 2192], [1, 13, 1924]])
+        self.assertEqual(ranking[:, :3].tolist(), [list(win)[:2] + [bingo_subsystem.draw_order[win[1]]]
+                                                   for win in bingo_engine.play(draw_order=bingo_subsystem.draw_order)])
+
+        # Only the first 11 draws: board 3 wins on 24, the others never do.
+        ranking = bingo_engine.ranking(draw_order=bingo_subsystem.draw_order[:12])
+        self.assertEqual(ranking.tolist(), [[2, 11, 24, 4512], [0, -1, -1, 0], [1, -1, -1, 0]])
+        self.assertEqual(BingoSubsystem(draw_order=bingo_subsystem.draw_order[:12], boards=bingo_subsystem.boards).run(part=PART.TWO), (None, None))
+
+        # Numbers drawn again rank at their first draw.
+        ranking = bingo_engine.ranking(draw_order=concatenate([bingo_subsystem.draw_order[:12], bingo_subsystem.draw_order[:12]]))
+        self.assertEqual(ranking.tolist(), [[2, 11, 24, 4512], [0, -1, -1, 0], [1, -1, -1, 0]])
+
+        print(f"Unittest {Examples.test_ranking_example} was successful.")
+
+    def test_evaluate_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_evaluate_example}")
+        from multiprocessing import get_context
+
+        bingo_subsystem: BingoSubsystem = BingoSubsystem.load(puzzle_input_file_path=join(dirname(__file__), "example.txt"))
+        bingo_engine: BingoEngine = bingo_subsystem.engine()
+        full_order: array = bingo_subsystem.draw_order
+        # The example order, the same order cut after board 3 wins (undrawn numbers padded with -1), and a reversal.
+        draw_orders: array = stack([full_order, where(arange(len(full_order)) < 12, full_order, -1), full_order[::-1]])
+
+        first_wins, last_wins = bingo_engine.evaluate(draw_orders=draw_orders, workers=1)
+        self.assertEqual(first_wins[:2].tolist(), [[2, 24, 4512], [2, 24, 4512]])
+        self.assertEqual(last_wins[:2].tolist(), [[1, 13, 1924], [-1, -1, 0]])
+
+        for draw_order, first_win, last_win in zip(draw_orders, first_wins, last_wins):
+            wins: List[Tuple[int, int, int]] = list(bingo_engine.play(draw_order=draw_order))
+            self.assertEqual(first_win.tolist(), [wins[0][0], draw_order[wins[0][1]], wins[0][2]])
+
+        pooled_first_wins, pooled_last_wins = bingo_engine.evaluate(draw_orders=draw_orders, workers=2)
+        self.assertEqual(pooled_first_wins.tolist(), first_wins.tolist())
+        self.assertEqual(pooled_last_wins.tolist(), last_wins.tolist())
+        # No board was built, let alone marked.
+        self.assertEqual(len(bingo_subsystem.built_boards), 0)
+        self.assertEqual([bingo_board.puzzle_values.tolist() for bingo_board in bingo_subsystem.bingo_boards],
+                         bingo_subsystem.boards.tolist())
+
+        # Spawned workers import nothing from the parent, they load this solution from its file.
+        spawned_first_wins, spawned_last_wins = bingo_engine.evaluate(draw_orders=draw_orders, workers=2, mp_context=get_context("spawn"))
+        self.assertEqual(spawned_first_wins.tolist(), first_wins.tolist())
+        self.assertEqual(spawned_last_wins.tolist(), last_wins.tolist())
+
+        print(f"Unittest {Examples.test_evaluate_example} was successful.")
+
+    def test_bingo_board_example(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_bingo_board_example}")
+
+        bingo_subsystem: BingoSubsystem = BingoSubsystem.load(puzzle_input_file_path=join(dirname(__file__), "example.txt"))
+        bingo_board: BingoBoard = BingoBoard(puzzle_values=bingo_subsystem.boards[2])
+        for draw in bingo_subsystem.draw_order[:11].tolist():
+            self.assertEqual(bingo_board.check_draw(draw), draw in bingo_board.cells_by_value)
+            self.assertFalse(bingo_board.is_winner())
+        # 24 completes the top row.
+        bingo_board.check_draw(24)
+        self.assertTrue(bingo_board.is_winner())
+        self.assertEqual(bingo_board.score(winning_draw=24), 4512)
+
+        # A diagonal only wins when asked for.
+        diagonal: List[int] = bingo_subsystem.boards[0].diagonal().tolist()
+        for diagonals in (False, True):
+            bingo_board = BingoBoard(puzzle_values=bingo_subsystem.boards[0], diagonals=diagonals)
+            for draw in diagonal + diagonal:
+                bingo_board.check_draw(draw)
+            self.assertEqual(bingo_board.is_winner(), diagonals)
+        bingo_board.reset()
+        self.assertFalse(bingo_board.is_winner() or bingo_board.puzzle_states.any())
+
+        print(f"Unittest {Examples.test_bingo_board_example} was successful.")
+
+    def test_diagonals(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_diagonals}")
+
+        # The main diagonal completes on 8, before the top row does on 2.
+        draw_order: array = array([0, 4, 8, 1, 2])
+        bingo_subsystem: BingoSubsystem = BingoSubsystem(draw_order=draw_order,
+                                                         bingo_boards=[BingoBoard(puzzle_values=arange(9).reshape(3, 3), diagonals=True)])
+        winning_board, winning_draw = bingo_subsystem.run(part=PART.ONE)
+        self.assertEqual((winning_draw, winning_board.score(winning_draw=winning_draw)), (8, 192))
+        self.assertEqual(list(bingo_subsystem.engine().play(draw_order=draw_order)), [(0, 2, 192)])
+
+        # The anti-diagonal, and rows only without the option.
+        draw_order = array([2, 4, 6, 0, 1])
+        self.assertEqual(BingoEngine(boards=arange(9).reshape(1, 3, 3), diagonals=True).ranking(draw_order=draw_order).tolist(),
+                         [[0, 2, 6, 6 * 24]])
+        self.assertEqual(BingoEngine(boards=arange(9).reshape(1, 3, 3)).ranking(draw_order=draw_order).tolist(),
+                         [[0, 4, 1, 1 * 23]])
+
+        print(f"Unittest {Examples.test_diagonals} was successful.")
+
+    def test_no_boards(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_no_boards}")
+
+        with TemporaryDirectory() as temporary_directory:
+            board_file_path: str = join(temporary_directory, "boards.txt")
+            with open(board_file_path, "w") as board_file:
+                board_file.write("7,4,9\n")
+
+            bingo_subsystem: BingoSubsystem = BingoSubsystem.load(board_file_path)
+            self.assertEqual(bingo_subsystem.boards.shape, (0, 5, 5))
+            self.assertEqual(bingo_subsystem.run(part=PART.ONE), (None, None))
+            self.assertEqual(bingo_subsystem.run(part=PART.TWO), (None, None))
+
+            bingo_engine: BingoEngine = bingo_subsystem.engine()
+            self.assertEqual(bingo_engine.ranking(draw_order=bingo_subsystem.draw_order).shape, (0, 4))
+            self.assertEqual(list(bingo_engine.play(draw_order=bingo_subsystem.draw_order)), [])
+            first_wins, last_wins = bingo_engine.evaluate(draw_orders=bingo_subsystem.draw_order[None, :], workers=1)
+            self.assertEqual(first_wins.tolist(), [[-1, -1, 0]])
+            self.assertEqual(last_wins.tolist(), [[-1, -1, 0]])
+
+        print(f"Unittest {Examples.test_no_boards} was successful.")
+
+    def test_board_loaders(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_board_loaders}")
+
+        example_file_path: str = join(dirname(__file__), "example.txt")
+        draw_order, boards = BingoSubsystem.parse(example_file_path)
+        self.assertEqual(boards.shape, (3, 5, 5))
+        self.assertEqual(draw_order[:3].tolist(), [7, 4, 9])
+        self.assertEqual(boards[2, 4].tolist(), [2, 0, 12, 3, 7])
+
+        # Blocks of two boards from chunks small enough to cut every few lines.
+        blocks: List[array] = list(BingoSubsystem.iterate_board_blocks(example_file_path, boards_per_block=2, chunk_bytes=40))
+        self.assertEqual([block.shape[0] for block in blocks], [2, 1])
+        self.assertEqual(concatenate(blocks).tolist(), boards.tolist())
+
+        # The final board is kept without a trailing blank line, and with blank lines after it.
+        with TemporaryDirectory() as temporary_directory:
+            board_file_path: str = join(temporary_directory, "boards.txt")
+            with open(board_file_path, "w") as board_file:
+                board_file.write("1,2\n\n" + "\n".join(" ".join(str(5 * row + column) for column in range(5)) for row in range(5)) + "\n\n\n")
+            self.assertEqual(BingoSubsystem.load(board_file_path).engine().boards.reshape(-1).tolist(), list(range(25)))
+            self.assertEqual(len(list(BingoSubsystem.iterate_board_blocks(board_file_path, chunk_bytes=7))), 1)
+
+        print(f"Unittest {Examples.test_board_loaders} was successful.")
+
 class Solutions(TestCase):
     def test_part_one(self) -> None:
         print(f"\nCalculating solution to {Solutions.test_part_one}")
@@ -6,16 +6,44 @@ __email__ = "jacobtaylorcassady@outlook.com"
 
 # Built-in modules
 from unittest import TestCase, main
+from bisect import bisect_left, bisect_right, insort
 from enum import unique, Enum
-from os.path import isfile, join, dirname
-from typing import List, Tuple, Dict
-from parse import parse
+from os.path import isfile, join, dirname, abspath
+from sys import path as system_path
+from typing import Iterator, List, Optional, Tuple, Dict
+
+# 3rd Party modules
+from numpy import array, abs as absolute, arange, cumsum, int64, maximum, minimum, repeat, sign, uint16, zeros, \
+    count_nonzero, diff, flatnonzero, split, unique as unique_values
+
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.snapshot import load_snapshot
+from common.instrumentation import instrument
+from common.tokenizer import load_segments
 
 @unique
 class PART(Enum):
     ONE: str = "one"
     TWO: str = "two"
 
+@unique
+class ENGINE(Enum):
+    # Line.get_points and a dictionary of point counts.
+    POINTS: str = "points"
+    # RasterEngine.
+    RASTER: str = "raster"
+    # SweepEngine.
+    SWEEP: str = "sweep"
+
+# Points rasterized at once by RasterEngine, bounding its memory beyond the grid itself.
+RASTER_CHUNK_POINTS: int = 1 << 20
+# Line orientations of the sweep engine, horizontal, vertical, diagonal and anti-diagonal: (a, b, c, d) where
+# a*x + b*y is the same for every point of a line (its key) and c*x + d*y runs along the line.
+ORIENTATIONS: Tuple[Tuple[int, int, int, int], ...] = ((0, 1, 1, 0), (1, 0, 0, 1), (1, -1, 1, 0), (1, 1, 1, 0))
+# Intervals of positions along the lines of one orientation: starts and ends by line key, sorted and disjoint.
+Intervals = Dict[int, Tuple[List[int], List[int]]]
+
 class Line(object):
     FORMAT: str = "{},{} -> {},{}"
     def __init__(self, x1: int, y1: int, x2: int, y2: int) -> None:
@@ -27,6 +55,7 @@ class Line(object):
         return f"({self.x1},{self.y1}) -> ({self.x2},{self.y2}) : {self.points}"
 
     @staticmethod
+    @instrument()
     def get_points(x1: int, y1: int, x2: int, y2: int) -> List[Tuple[int, int]]:
         if y1 == y2:
             if x1 > x2:
@@ -59,18 +88,280 @@ class Line(object):
     def y_intercept(x1: int, y1: int, x2: int, y2: int) -> float:
         return (x1*y2 - x2*y1) / (x1-x2)
 
+class RasterEngine(object):
+    def __init__(self, segments: array) -> None:
+        """Constructor. Rasterizes horizontal, vertical and 45° segments with integer steps into dense grids of point
+        counts, one for each part, from a single pass over the points.
+
+        Args:
+            segments (array): x1, y1, x2, y2 of every segment, shape (segments, 4). Other diagonals are ignored."""
+        self.segments: array = segments.astype(int64, copy=False)
+        x1, y1, x2, y2 = self.segments.T
+        self.axis_aligned: array = (x1 == x2) | (y1 == y2)
+        self.diagonal: array = ~self.axis_aligned & (absolute(x2 - x1) == absolute(y2 - y1))
+        # Grid spanning every kept segment, shifted so its lowest coordinates are 0.
+        kept: array = self.segments[self.axis_aligned | self.diagonal]
+        self.origin_x: int = int(minimum(kept[:, 0], kept[:, 2]).min()) if len(kept) else 0
+        self.origin_y: int = int(minimum(kept[:, 1], kept[:, 3]).min()) if len(kept) else 0
+        self.width: int = int(maximum(kept[:, 0], kept[:, 2]).max()) - self.origin_x + 1 if len(kept) else 0
+        self.height: int = int(maximum(kept[:, 1], kept[:, 3]).max()) - self.origin_y + 1 if len(kept) else 0
+
+    @instrument()
+    def point_indices(self, segments: array) -> array:
+        """Flat grid index of every lattice point of the segments, endpoints included.
+
+        Returns:
+            array: int64 indices, the points of each segment in turn."""
+        x1, y1, x2, y2 = segments.T
+        step_x: array = sign(x2 - x1)
+        step_y: array = sign(y2 - y1)
+        lengths: array = maximum(absolute(x2 - x1), absolute(y2 - y1)) + 1
+        # Step t of every point along its segment: 0, 1, ..., length - 1 for each segment in turn.
+        segment_starts: array = cumsum(lengths) - lengths
+        steps: array = arange(lengths.sum(), dtype=int64) - repeat(segment_starts, lengths)
+        xs: array = repeat(x1 - self.origin_x, lengths) + repeat(step_x, lengths) * steps
+        ys: array = repeat(y1 - self.origin_y, lengths) + repeat(step_y, lengths) * steps
+        return ys * self.width + xs
+
+    @instrument()
+    def accumulate(self, point_counts: array, segments: array) -> None:
+        """Adds the points of the segments to a flat uint16 grid in place, saturating at 65535 lines. The segments are
+        rasterized RASTER_CHUNK_POINTS points at a time, so only the grid grows with the area they span."""
+        lengths: array = maximum(absolute(segments[:, 2] - segments[:, 0]), absolute(segments[:, 3] - segments[:, 1])) + 1
+        chunk_indices: array = (cumsum(lengths) - lengths) // RASTER_CHUNK_POINTS
+
+        for chunk in split(segments, flatnonzero(diff(chunk_indices)) + 1):
+            indices, counts = unique_values(self.point_indices(chunk), return_counts=True)
+            point_counts[indices] = minimum(point_counts[indices] + counts, 65535)
+
+    @instrument()
+    def point_counts(self, part: PART) -> array:
+        """Lines covering each point of the grid, part one counting horizontal and vertical lines only.
+
+        Returns:
+            array: uint16 grid of shape (height, width), saturating at 65535 lines."""
+        point_counts: array = zeros(self.width * self.height, dtype=uint16)
+        self.accumulate(point_counts, self.segments[self.axis_aligned])
+
+        if part == PART.TWO:
+            self.accumulate(point_counts, self.segments[self.diagonal])
+
+        return point_counts.reshape(self.height, self.width)
+
+    def overlap_count(self, part: PART) -> int:
+        """Points covered by at least two lines, diagonals are only rasterized for part two."""
+        return int(count_nonzero(self.point_counts(part=part) > 1))
+
+    @instrument()
+    def overlap_counts(self) -> Dict[PART, int]:
+        """Points covered by at least two lines for both parts. The diagonal points are added to the part one counts
+        rather than rasterizing every line again.
+
+        Returns:
+            Dict[PART, int]: The overlap count of each part."""
+        point_counts: array = self.point_counts(part=PART.ONE)
+        part_one: int = int(count_nonzero(point_counts > 1))
+        self.accumulate(point_counts.reshape(-1), self.segments[self.diagonal])
+
+        return {PART.ONE: part_one, PART.TWO: int(count_nonzero(point_counts > 1))}
+
+
+class SweepEngine(object):
+    def __init__(self, segments: array) -> None:
+        """Constructor. Counts overlaps without visiting the points of the lines, so memory grows with the number of
+        lines whatever their length or coordinates.
+
+        Lines of the same orientation and key are collinear: they are merged into interval unions, and the stretches
+        covered at least twice into overlap intervals. Lines of different orientations meet in at most one point, the
+        crossings are found with a sweep over the lines of one orientation against a sorted index of the other's.
+
+        Args:
+            segments (array): x1, y1, x2, y2 of every segment, shape (segments, 4). Diagonals other than 45° are
+                ignored."""
+        lines: List[List[Tuple[int, int, int]]] = [[] for _ in ORIENTATIONS]
+
+        for x1, y1, x2, y2 in segments.tolist():
+            orientation: Optional[int] = SweepEngine.orientation(dx=x2 - x1, dy=y2 - y1)
+
+            if orientation is not None:
+                a, b, c, d = ORIENTATIONS[orientation]
+                start, end = sorted((c * x1 + d * y1, c * x2 + d * y2))
+                lines[orientation].append((a * x1 + b * y1, start, end))
+
+        self.unions: List[Intervals] = []
+        self.overlaps: List[Intervals] = []
+        for orientation_lines in lines:
+            unions, overlaps = SweepEngine.interval_sets(lines=orientation_lines)
+            self.unions.append(unions)
+            self.overlaps.append(overlaps)
+
+    @staticmethod
+    def orientation(dx: int, dy: int) -> Optional[int]:
+        """Index in ORIENTATIONS of a segment, single points being horizontal. None for other diagonals."""
+        if dy == 0:
+            return 0
+        elif dx == 0:
+            return 1
+        elif dx == dy:
+            return 2
+        elif dx == -dy:
+            return 3
+
+        return None
+
+    @staticmethod
+    def interval_sets(lines: List[Tuple[int, int, int]]) -> Tuple[Intervals, Intervals]:
+        """Merges collinear lines.
+
+        Args:
+            lines (List[Tuple[int, int, int]]): Key, start and end of every line of one orientation.
+
+        Returns:
+            Tuple[Intervals, Intervals]: Positions covered by the lines, and covered by at least two of them."""
+        unions: Intervals = {}
+        overlaps: Intervals = {}
+
+        # Sorted by start, a position is covered twice when a line starts before the union of the previous ones ends.
+        for key, start, end in sorted(lines):
+            union_starts, union_ends = unions.setdefault(key, ([], []))
+
+            if union_ends and start <= union_ends[-1]:
+                overlap_starts, overlap_ends = overlaps.setdefault(key, ([], []))
+                overlap_end: int = min(end, union_ends[-1])
+
+                if overlap_ends and start <= overlap_ends[-1] + 1:
+                    overlap_ends[-1] = max(overlap_ends[-1], overlap_end)
+                else:
+                    overlap_starts.append(start)
+                    overlap_ends.append(overlap_end)
+
+            if union_ends and start <= union_ends[-1] + 1:
+                union_ends[-1] = max(union_ends[-1], end)
+            else:
+                union_starts.append(start)
+                union_ends.append(end)
+
+        return unions, overlaps
+
+    @staticmethod
+    def contains(intervals: Intervals, orientation: int, point: Tuple[int, int]) -> bool:
+        a, b, c, d = ORIENTATIONS[orientation]
+        x, y = point
+        starts, ends = intervals.get(a * x + b * y, ((), ()))
+        position: int = c * x + d * y
+        index: int = bisect_right(starts, position) - 1
+        return index >= 0 and position <= ends[index]
+
+    @staticmethod
+    def crossing(row_orientation: int, row: int, column_orientation: int, column: int) -> Optional[Tuple[int, int]]:
+        """Lattice point where the line keyed row of one orientation meets the line keyed column of another. None when
+        they meet between lattice points, as diagonals whose keys differ in parity do."""
+        a1, b1, _, _ = ORIENTATIONS[row_orientation]
+        a2, b2, _, _ = ORIENTATIONS[column_orientation]
+        determinant: int = a1 * b2 - a2 * b1
+        x, x_remainder = divmod(row * b2 - column * b1, determinant)
+        y, y_remainder = divmod(a1 * column - a2 * row, determinant)
+        return (x, y) if x_remainder == 0 and y_remainder == 0 else None
+
+    @staticmethod
+    def key_ranges(intervals: Intervals, orientation: int, other_orientation: int) -> List[Tuple[int, int, int]]:
+        """Key of every interval with the lowest and highest key of other_orientation along it."""
+        a, b, c, d = ORIENTATIONS[orientation]
+        other_a, other_b, _, _ = ORIENTATIONS[other_orientation]
+        # Key and position give back x and y, the determinant of every orientation is 1 or -1.
+        determinant: int = a * d - b * c
+        key_ranges: List[Tuple[int, int, int]] = []
+
+        for key, (starts, ends) in intervals.items():
+            for start, end in zip(starts, ends):
+                other_keys: List[int] = [(other_a * (key * d - position * b) + other_b * (a * position - c * key)) * determinant
+                                         for position in (start, end)]
+                key_ranges.append((key, min(other_keys), max(other_keys)))
+
+        return key_ranges
+
+    @staticmethod
+    def crossings(row_intervals: Intervals, row_orientation: int, column_intervals: Intervals,
+                  column_orientation: int) -> Iterator[Tuple[int, int]]:
+        """Points where an interval of one orientation crosses an interval of another. In the plane of both keys every
+        row interval is a horizontal segment at its key and every column interval a vertical one: the sweep walks the
+        rows in order, keeping the keys of the column intervals spanning the current row in a sorted list.
+
+        Returns:
+            Iterator[Tuple[int, int]]: Every crossing once, by increasing row key."""
+        rows: List[Tuple[int, int, int]] = sorted(SweepEngine.key_ranges(row_intervals, row_orientation, column_orientation))
+        columns: List[Tuple[int, int, int]] = SweepEngine.key_ranges(column_intervals, column_orientation, row_orientation)
+        insertions: List[Tuple[int, int]] = sorted((first_row, column) for column, first_row, _ in columns)
+        removals: List[Tuple[int, int]] = sorted((last_row, column) for column, _, last_row in columns)
+        active_columns: List[int] = []
+        inserted, removed = 0, 0
+
+        for row, first_column, last_column in rows:
+            while inserted < len(insertions) and insertions[inserted][0] <= row:
+                insort(active_columns, insertions[inserted][1])
+                inserted += 1
+            while removed < len(removals) and removals[removed][0] < row:
+                del active_columns[bisect_left(active_columns, removals[removed][1])]
+                removed += 1
+
+            for column in active_columns[bisect_left(active_columns, first_column):bisect_right(active_columns, last_column)]:
+                point: Optional[Tuple[int, int]] = SweepEngine.crossing(row_orientation, row, column_orientation, column)
+
+                if point is not None:
+                    yield point
+
+    @instrument()
+    def overlap_count(self, part: PART) -> int:
+        """Points covered by at least two lines, each counted once: the overlaps of collinear lines by length, less the
+        points where overlaps of different orientations cross, plus the crossings of lines of different orientations
+        outside of every overlap. A crossing of more than two orientations is kept by its two lowest ones only."""
+        orientations: range = range(2 if part == PART.ONE else len(ORIENTATIONS))
+        overlap_count: int = sum(end - start + 1 for orientation in orientations
+                                 for starts, ends in self.overlaps[orientation].values() for start, end in zip(starts, ends))
+
+        for first in orientations:
+            for second in range(first + 1, len(orientations)):
+                for point in SweepEngine.crossings(self.overlaps[first], first, self.overlaps[second], second):
+                    # Counted by every overlap holding it, only the lowest orientation's count stays.
+                    if not any(SweepEngine.contains(self.overlaps[lower], lower, point) for lower in range(first)):
+                        overlap_count -= 1
+
+                for point in SweepEngine.crossings(self.unions[first], first, self.unions[second], second):
+                    if any(SweepEngine.contains(self.unions[lower], lower, point) for lower in range(second) if lower != first):
+                        continue
+                    if any(SweepEngine.contains(self.overlaps[orientation], orientation, point) for orientation in orientations):
+                        continue
+                    overlap_count += 1
+
+        return overlap_count
+
+
 class Puzzle(object):
-    def __init__(self, lines: List[Line]) -> None:
-        self.point_counts: Dict[Tuple[int, int], int] = Puzzle.count_points(lines=lines)
+    def __init__(self, segments: array, part: PART, engine: ENGINE = ENGINE.RASTER) -> None:
+        """Constructor.
+
+        Args:
+            segments (array): x1, y1, x2, y2 of every segment, shape (segments, 4).
+            part (PART): Part one ignores diagonal lines.
+            engine (ENGINE, optional): How overlaps are counted. Defaults to ENGINE.RASTER."""
+        self.segments: array = segments
+        self.part: PART = part
+        self.engine: ENGINE = engine
 
     def evaluate(self) -> int:
-        return Puzzle.overlap_count(point_counts=self.point_counts)
+        if self.engine == ENGINE.RASTER:
+            return RasterEngine(segments=self.segments).overlap_count(part=self.part)
+        elif self.engine == ENGINE.SWEEP:
+            return SweepEngine(segments=self.segments).overlap_count(part=self.part)
+
+        return Puzzle.overlap_count(point_counts=Puzzle.count_points(lines=Puzzle.lines(segments=self.segments, part=self.part)))
 
     @staticmethod
     def overlap_count(point_counts: Dict[Tuple[int, int], int]) -> int:
         return len([(point, point_count) for (point, point_count) in point_counts.items() if point_count > 1])
 
     @staticmethod
+    @instrument()
     def count_points(lines: List[Line]) -> Dict[Tuple[int, int], int]:
         point_counts: Dict[Tuple[int, int], int] = {}
 
@@ -83,28 +374,34 @@ class Puzzle(object):
 
         return point_counts
 
-
     @staticmethod
-    def load(puzzle_input_file_path: str, part: PART) -> Puzzle:
-        assert isfile(puzzle_input_file_path), f"File not found: {puzzle_input_file_path}"
-
+    @instrument()
+    def lines(segments: array, part: PART) -> List[Line]:
+        """Lines of the segments counted by part: horizontal and vertical ones, plus 45° diagonals for part two."""
         lines: List[Line] = []
-        with open(puzzle_input_file_path) as puzzle_input_file:
-            for text_line in puzzle_input_file.readlines():
-                x1, y1, x2, y2 = parse(Line.FORMAT, text_line)
-                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-                line: Line = Line(int(x1), int(y1), int(x2), int(y2))
-
-                if x1 == x2 or y1 == y2:
-                    lines.append(line)
-                else:
-                    if part == PART.TWO:
-                        slope: int = Line.slope(int(x1), int(y1), int(x2), int(y2))
+        for x1, y1, x2, y2 in segments.tolist():
+            if x1 == x2 or y1 == y2:
+                lines.append(Line(x1, y1, x2, y2))
+            elif part == PART.TWO and abs(Line.slope(x1, y1, x2, y2)) == 1:
+                lines.append(Line(x1, y1, x2, y2))
 
-                        if slope == 1 or slope == -1:
-                            lines.append(line)
+        return lines
 
-        return Puzzle(lines=lines)
+    @staticmethod
+    @instrument()
+    def parse_segments(puzzle_input_file_path: str) -> array:
+        """Parses every "x1,y1 -> x2,y2" line of the puzzle input.
+
+        Returns:
+            array: int32 array of shape (lines, 4) holding x1, y1, x2, y2."""
+        return load_segments(puzzle_input_file_path)
+
+    @staticmethod
+    @instrument()
+    def load(puzzle_input_file_path: str, part: PART, engine: ENGINE = ENGINE.RASTER) -> Puzzle:
+        assert isfile(puzzle_input_file_path), f"File not found: {puzzle_input_file_path}"
+        return Puzzle(segments=load_snapshot(puzzle_input_file_path, "segments", Puzzle.parse_segments), part=part,
+                      engine=engine)
 
 
 class Examples(TestCase):
@@ -126,6 +423,40 @@ class Examples(TestCase):
 
         print(f"Unittest {Examples.test_part_two_example} was successful.")
 
+    def test_engines(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_engines}")
+
+        for part, overlap_count in ((PART.ONE, 5), (PART.TWO, 12)):
+            for engine in ENGINE:
+                test_puzzle: Puzzle = Puzzle.load(puzzle_input_file_path=join(dirname(__file__), "example.txt"),
+                                                  part=part, engine=engine)
+                self.assertEqual(test_puzzle.evaluate(), overlap_count)
+
+        raster_engine: RasterEngine = RasterEngine(segments=Puzzle.parse_segments(join(dirname(__file__), "example.txt")))
+        self.assertEqual(raster_engine.overlap_counts(), {PART.ONE: 5, PART.TWO: 12})
+        self.assertEqual(raster_engine.point_counts(part=PART.TWO).dtype, uint16)
+        # The example's diagram, top row: 1.1....11.
+        self.assertEqual(raster_engine.point_counts(part=PART.TWO)[0].tolist(), [1, 0, 1, 0, 0, 0, 0, 1, 1, 0])
+        # Reversed, negative and non-45° segments.
+        self.assertEqual(RasterEngine(segments=array([[3, -2, -1, 2], [-1, 0, 3, 0], [0, 0, 2, 5]])).overlap_counts(),
+                         {PART.ONE: 0, PART.TWO: 1})
+
+        print(f"Unittest {Examples.test_engines} was successful.")
+
+    def test_sweep_engine(self) -> None:
+        print(f"\nPerforming unittest: {Examples.test_sweep_engine}")
+
+        # Lines billions of points long overlapping on 10^9 + 1 points, all four orientations crossing at the origin
+        # inside that overlap, diagonals of different parities meeting between lattice points and three diagonal
+        # points covered twice: (4, 4), (5, 5) and (6, 6).
+        sweep_engine: SweepEngine = SweepEngine(segments=array([[-10**9, 0, 10**9, 0], [0, 0, 10**9, 0], [0, -10**9, 0, 10**9],
+                                                                [-5, -5, 5, 5], [5, -5, -5, 5], [10**9, 5, 10**9, 5],
+                                                                [2, 1, 3, 0], [4, 4, 6, 6], [6, 6, 7, 7]], dtype=int64))
+        self.assertEqual(sweep_engine.overlap_count(part=PART.ONE), 10**9 + 1)
+        self.assertEqual(sweep_engine.overlap_count(part=PART.TWO), 10**9 + 1 + 3)
+
+        print(f"Unittest {Examples.test_sweep_engine} was successful.")
+
 class Solutions(TestCase):
     def test_part_one(self) -> None:
         print(f"\nCalculating solution to {Solutions.test_part_one}")
@@ -6,9 +6,14 @@ __email__ = "jacobtaylorcassady@outlook.com"
 
 # Built-in modules
 from unittest import TestCase, main
-from os.path import isfile, join, dirname
+from os.path import isfile, join, dirname, abspath
+from sys import path as system_path
 from typing import List
 
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.instrumentation import instrument
+
 class LaternFishSchool(object):
     def __init__(self, initial_fish_days: List[int]) -> None:
         # indices represent days until reproduction
@@ -17,6 +22,7 @@ class LaternFishSchool(object):
         for initial_fish_day in initial_fish_days:
             self.latern_fish[initial_fish_day] += 1
 
+    @instrument()
     def run(self, days: int) -> int:
         for day in range(days):
             for days_left_to_reproduce, latern_fish in enumerate(self.latern_fish):
@@ -32,6 +38,7 @@ class LaternFishSchool(object):
         return sum(self.latern_fish)
 
     @staticmethod
+    @instrument()
     def load(puzzle_input_file_path: str) -> LaternFishSchool:
         assert isfile(puzzle_input_file_path), f"File not found: {puzzle_input_file_path}"
 
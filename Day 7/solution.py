@@ -7,12 +7,19 @@ __email__ = "jacobtaylorcassady@outlook.com"
 # Built-in modules
 from unittest import TestCase, main
 from enum import unique, Enum
-from os.path import isfile, join, dirname
+from os.path import isfile, join, dirname, abspath
+from sys import path as system_path
 
 # 3rd Party modules
 from numpy import array, abs, sum, median, mean
 from math import ceil, floor
 
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.loader import load_integers
+from common.snapshot import load_snapshot
+from common.instrumentation import instrument
+
 @unique
 class PART(Enum):
     ONE: str = "one"
@@ -22,12 +29,14 @@ class PART(Enum):
         if self == PART.ONE:
             return d
         elif self == PART.TWO:
-            return d*(d+1)/2
+            # 1. keeps int32 distances from overflowing before the division.
+            return d*(d+1.)/2
 
 class CrabSubmarines(object):
     def __init__(self, crab_starting_positions: array) -> None:
         self.crab_starting_positions: array = crab_starting_positions
 
+    @instrument()
     def calculate_minimum_fuel_usage(self, part: PART) -> int:
         if part == PART.ONE:
             return int(sum(abs(self.crab_starting_positions - median(self.crab_starting_positions))))
@@ -36,13 +45,11 @@ class CrabSubmarines(object):
                         sum(PART.TWO.fuel_usage(abs(self.crab_starting_positions - ceil(mean(self.crab_starting_positions)))))))
 
     @staticmethod
+    @instrument()
     def load(puzzle_input_file_path: str) -> CrabSubmarines:
         assert isfile(puzzle_input_file_path), f"File not found: {puzzle_input_file_path}"
 
-        with open(puzzle_input_file_path) as puzzle_input_file:
-            crab_starting_positions: array = array([int(puzzle_input) for puzzle_input in puzzle_input_file.read().split(",") if puzzle_input != ""])
-
-        return CrabSubmarines(crab_starting_positions=crab_starting_positions)
+        return CrabSubmarines(crab_starting_positions=load_snapshot(puzzle_input_file_path, "positions", load_integers))
 
 class Examples(TestCase):
     def test_part_one_example(self) -> None:
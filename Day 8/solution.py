@@ -7,9 +7,14 @@ __email__ = "jacobtaylorcassady@outlook.com"
 # Built-in modules
 from unittest import TestCase, main
 from enum import Enum, unique
-from os.path import isfile, join, dirname
+from os.path import isfile, join, dirname, abspath
+from sys import path as system_path
 from typing import List, Dict, Set
 
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.instrumentation import instrument
+
 @unique
 class DIGIT(Enum):
     """ 0:      1:      2:      3:      4:
@@ -183,6 +188,7 @@ class SevenSegmentDisplay(object):
                     "decoded_output": self.decoded_output})
 
     @staticmethod
+    @instrument()
     def decode_seven_segment_display(signal_pattern: str, output_pattern: str) -> List[DIGIT]:
         segment_solution: Dict[SEGMENT, WIRE] = {}
         wire_counts: Dict[WIRE, int] = {}
@@ -280,9 +286,11 @@ class Puzzle(object):
     def __str__(self) -> str:
         return "\n".join([str(seven_segment_display) for seven_segment_display in self.seven_segment_displays])
 
+    @instrument()
     def sum_displays(self) -> int:
         return sum([seven_segment_display.output() for seven_segment_display in self.seven_segment_displays])
 
+    @instrument()
     def count_digits(self, digits: Set[DIGIT]) -> int:
         digit_count: int = 0
 
@@ -294,6 +302,7 @@ class Puzzle(object):
         return digit_count
 
     @staticmethod
+    @instrument()
     def load(puzzle_input_file_path: str) -> Puzzle:
         assert isfile(puzzle_input_file_path), f"File not found: {puzzle_input_file_path}"
 
@@ -6,13 +6,18 @@ __email__ = "jacobtaylorcassady@outlook.com"
 
 # Built-in modules
 from unittest import TestCase, main
-from os.path import isfile, join, dirname
-from typing import Union, List, Tuple
+from os.path import isfile, join, dirname, abspath
+from sys import path as system_path
+from typing import List, Tuple
 
 # 3rd Party modules
 from numpy import array, where, product
-from scipy.ndimage.morphology import generate_binary_structure
-from scipy.ndimage.filters import minimum_filter
+
+# Local modules
+system_path.append(dirname(dirname(abspath(__file__))))
+from common.loader import load_digit_grid
+from common.snapshot import load_snapshot
+from common.instrumentation import instrument
 
 
 class Cave(object):
@@ -23,21 +28,33 @@ class Cave(object):
             height_map (array): Cave height as 2d array of integers"""
         self.height_map: array = height_map
 
+    @instrument()
     def get_minimum_risk_level(self) -> int:
         """Treats height map as an image and utilizes scipy.ndimage library to solve for risk level.
 
         Returns:
             int: risk_level"""
+        # scipy.ndimage is imported on use, importing it costs more than solving the puzzle.
+        from scipy.ndimage.morphology import generate_binary_structure
+        from scipy.ndimage.filters import minimum_filter
+
         neighborhood: array = generate_binary_structure(len(self.height_map.shape), 2)
         local_min: array = self.height_map[where(minimum_filter(self.height_map, footprint=neighborhood) == self.height_map)]
         risk_level: array = local_min + 1 
         return sum(risk_level)
 
+    @instrument()
     def size_three_largest_basins(self) -> int:
+        from scipy.ndimage.morphology import generate_binary_structure
+        from scipy.ndimage.filters import minimum_filter
+
+        @instrument()
         def size_local_basin(minimum_x: int, minimum_y: int) -> int:
             basin_locations: List[Tuple[int, int]] = []
             basin_locations.append((minimum_x, minimum_y))
 
+            # Recursive, each level of the search is recorded as a phase nested in the previous one.
+            @instrument()
             def search_basin(x: int, y: int) -> None:
                 current_value: int = self.height_map[x, y]
 
@@ -89,6 +106,7 @@ class Cave(object):
         return product(basin_sizes[-3:])
 
     @staticmethod
+    @instrument()
     def load(puzzle_input_file_path: str) -> Cave:
         """Parses puzzle input file into Cave object.
 
@@ -98,14 +116,8 @@ class Cave(object):
         Returns:
             Cave: Object-oriented representation of problem."""
         assert isfile(puzzle_input_file_path), f"File not found: {puzzle_input_file_path}"
-        height_map: Union[array, List[array]] = []
-
-        with open(puzzle_input_file_path) as puzzle_input_file:
-            for line in puzzle_input_file.readlines():
-                height_line: array = array([int(value) for value in line if value !="\n"])
-                height_map.append(height_line)
 
-        return Cave(height_map=array(height_map))
+        return Cave(height_map=load_snapshot(puzzle_input_file_path, "digit_grid", load_digit_grid))
 
 
 class Examples(TestCase):
@@ -0,0 +1,147 @@
+"""benchmark.py: Runs every day against synthetic inputs of growing size and reports throughput and scaling"""
+from __future__ import annotations
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
+
+# Built-in modules
+from argparse import ArgumentParser, Namespace
+from json import dumps
+from math import log
+from multiprocessing import Pool, TimeoutError
+from os.path import join
+from sys import exit
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional
+
+# Local modules
+from common.days import PARTS, discover_days
+from common.generators import GENERATORS, write_input
+from run_all import run_part
+
+
+def measure(day: int, part: str, input_file_path: str, timeout: float) -> Dict[str, Any]:
+    """Runs one part in a fresh worker process so that state cannot leak between sizes and runaway solvers can be
+    killed once they exceed timeout.
+
+    Returns:
+        Dict[str, Any]: run_part result, with error "timeout" when the solver was killed."""
+    with Pool(processes=1) as pool:
+        try:
+            return pool.apply_async(run_part, (day, part, input_file_path)).get(timeout=timeout)
+        except TimeoutError:
+            return {"day": day, "part": part, "answer": None, "import_seconds": None,
+                    "load_seconds": None, "solve_seconds": None, "error": "timeout"}
+
+def scaling_exponent(scales: List[int], seconds: List[float]) -> Optional[float]:
+    """Least squares slope of log(seconds) against log(scale). ~1 means linear, ~2 quadratic.
+
+    Returns:
+        Optional[float]: Fitted exponent, None with fewer than two measurements."""
+    if len(scales) < 2:
+        return None
+
+    log_scales: List[float] = [log(scale) for scale in scales]
+    log_seconds: List[float] = [log(max(second, 1e-9)) for second in seconds]
+    mean_log_scale: float = sum(log_scales) / len(log_scales)
+    mean_log_seconds: float = sum(log_seconds) / len(log_seconds)
+
+    covariance: float = sum((x - mean_log_scale) * (y - mean_log_seconds) for x, y in zip(log_scales, log_seconds))
+    variance: float = sum((x - mean_log_scale) ** 2 for x in log_scales)
+    return covariance / variance
+
+def benchmark(days: List[int], scales: List[int], seed: int = 2021, timeout: float = 60.) -> List[Dict[str, Any]]:
+    """Generates an input per (day, scale) and measures both parts on it. Once a part times out or fails, larger
+    scales of that part are skipped.
+
+    Returns:
+        List[Dict[str, Any]]: One record per (day, part) holding per-scale measurements and the scaling exponent."""
+    records: List[Dict[str, Any]] = []
+
+    with TemporaryDirectory() as temporary_directory:
+        for day in days:
+            day_records: Dict[str, Dict[str, Any]] = {part: {"day": day, "part": part, "measurements": []} for part in PARTS}
+
+            for scale in scales:
+                active_parts: List[str] = [part for part in PARTS if day_records[part].get("stopped") is None]
+                if len(active_parts) == 0:
+                    break
+
+                input_file_path: str = join(temporary_directory, f"day_{day}_scale_{scale}.txt")
+                input_bytes: int = write_input(day=day, file_path=input_file_path, scale=scale, seed=seed)
+
+                for part in active_parts:
+                    result: Dict[str, Any] = measure(day=day, part=part, input_file_path=input_file_path, timeout=timeout)
+
+                    if result["error"] is not None:
+                        day_records[part]["stopped"] = {"scale": scale, "error": result["error"]}
+                        continue
+
+                    seconds: float = result["load_seconds"] + result["solve_seconds"]
+                    day_records[part]["measurements"].append({"scale": scale, "input_bytes": input_bytes,
+                                                              "load_seconds": result["load_seconds"],
+                                                              "solve_seconds": result["solve_seconds"],
+                                                              "megabytes_per_second": input_bytes / 1e6 / max(seconds, 1e-9),
+                                                              "answer": result["answer"]})
+
+            for part in PARTS:
+                measurements: List[Dict[str, Any]] = day_records[part]["measurements"]
+                day_records[part]["scaling_exponent"] = scaling_exponent(
+                    scales=[measurement["scale"] for measurement in measurements],
+                    seconds=[measurement["load_seconds"] + measurement["solve_seconds"] for measurement in measurements])
+                day_records[part].setdefault("stopped", None)
+                records.append(day_records[part])
+
+    return records
+
+def format_table(records: List[Dict[str, Any]]) -> str:
+    table_lines: List[str] = [f"{'Day':>3} {'Part':<4} {'Scale':>6} {'Bytes':>12} {'Load (s)':>10} {'Solve (s)':>10} {'MB/s':>9}",
+                              "-" * 60]
+
+    for record in records:
+        for measurement in record["measurements"]:
+            table_lines.append(f"{record['day']:>3} {record['part']:<4} {measurement['scale']:>6} {measurement['input_bytes']:>12} "
+                               f"{measurement['load_seconds']:>10.4f} {measurement['solve_seconds']:>10.4f} "
+                               f"{measurement['megabytes_per_second']:>9.3f}")
+
+        exponent: str = "-" if record["scaling_exponent"] is None else f"{record['scaling_exponent']:.2f}"
+        stopped: str = "" if record["stopped"] is None else \
+                       f", stopped at scale {record['stopped']['scale']} ({record['stopped']['error'].strip().splitlines()[-1]})"
+        table_lines.append(f"{record['day']:>3} {record['part']:<4} scaling exponent {exponent}{stopped}")
+
+    return "\n".join(table_lines)
+
+def parse_arguments() -> Namespace:
+    argument_parser: ArgumentParser = ArgumentParser(description=__doc__.split(": ", 1)[1])
+    argument_parser.add_argument("--days", type=int, nargs="+", default=None,
+                                 help="Day numbers to benchmark. Defaults to every day with a generator.")
+    argument_parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000],
+                                 help="Input size multipliers relative to the real puzzle input.")
+    argument_parser.add_argument("--seed", type=int, default=2021, help="Seed of the input generators.")
+    argument_parser.add_argument("--timeout", type=float, default=60.,
+                                 help="Seconds a single part may run before it and its larger scales are skipped.")
+    argument_parser.add_argument("--json", dest="json_file_path", default=None,
+                                 help="Write machine-readable results to this path, or '-' for stdout in place of the table.")
+    return argument_parser.parse_args()
+
+def main() -> int:
+    arguments: Namespace = parse_arguments()
+    days: List[int] = arguments.days if arguments.days is not None else \
+                      [day for day in discover_days().keys() if day in GENERATORS]
+
+    records: List[Dict[str, Any]] = benchmark(days=days, scales=sorted(arguments.scales),
+                                              seed=arguments.seed, timeout=arguments.timeout)
+
+    if arguments.json_file_path == "-":
+        print(dumps(records, indent=2))
+    else:
+        print(format_table(records))
+
+        if arguments.json_file_path is not None:
+            with open(arguments.json_file_path, "w") as json_file:
+                json_file.write(dumps(records, indent=2))
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
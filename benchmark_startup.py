@@ -0,0 +1,127 @@
+"""benchmark_startup.py: Measures the import cost of every day's solution with python -X importtime"""
+from __future__ import annotations
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
+
+# Built-in modules
+from argparse import ArgumentParser, Namespace
+from json import dumps
+from subprocess import run, PIPE
+from sys import executable, exit
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Local modules
+from common.days import discover_days
+
+
+def parse_import_times(importtime_output: str, module_name: str = "solution") -> Tuple[int, List[Tuple[str, int]]]:
+    """Parses python -X importtime output.
+
+    Args:
+        importtime_output (str): stderr of the interpreter run with -X importtime.
+        module_name (str, optional): Top level module whose cost is measured. Defaults to "solution".
+
+    Returns:
+        Tuple[int, List[Tuple[str, int]]]: Cumulative microseconds of module_name and its direct imports as
+            (name, cumulative microseconds), heaviest first."""
+    entries: List[Tuple[int, int, str]] = []
+
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        _, cumulative, name_field = line[len("import time:"):].split("|")
+        name: str = name_field.rstrip()
+        entries.append((int(cumulative), (len(name) - len(name.lstrip())) // 2, name.strip()))
+
+    for index, (cumulative, depth, name) in enumerate(entries):
+        if name == module_name and depth == 0:
+            # importtime prints children before their parent, so the direct imports precede the module entry.
+            direct_imports: List[Tuple[str, int]] = []
+
+            for child_cumulative, child_depth, child_name in reversed(entries[:index]):
+                if child_depth == 0:
+                    break
+                elif child_depth == 1:
+                    direct_imports.append((child_name, child_cumulative))
+
+            return cumulative, sorted(direct_imports, key=lambda direct_import: direct_import[1], reverse=True)
+
+    raise ValueError(f"{module_name} not found in importtime output")
+
+def measure_startup(day_directory: str, repeat: int = 3) -> Dict[str, Any]:
+    """Imports the day's solution in fresh interpreters, keeping the fastest of repeat runs.
+
+    Returns:
+        Dict[str, Any]: import_ms of the solution module, process_ms of the whole interpreter run and the heaviest
+            direct imports."""
+    best: Optional[Dict[str, Any]] = None
+
+    for _ in range(repeat):
+        start_time: float = perf_counter()
+        completed_process = run([executable, "-X", "importtime", "-c", "import solution"],
+                                cwd=day_directory, stderr=PIPE, stdout=PIPE, text=True)
+        process_ms: float = (perf_counter() - start_time) * 1e3
+        assert completed_process.returncode == 0, completed_process.stderr
+
+        cumulative_us, direct_imports = parse_import_times(completed_process.stderr)
+        measurement: Dict[str, Any] = {"import_ms": cumulative_us / 1e3, "process_ms": process_ms,
+                                       "heaviest_imports": [{"name": name, "ms": us / 1e3} for name, us in direct_imports[:5]]}
+
+        if best is None or measurement["import_ms"] < best["import_ms"]:
+            best = measurement
+
+    return best
+
+def interpreter_startup_ms(repeat: int = 3) -> float:
+    def run_once() -> float:
+        start_time: float = perf_counter()
+        run([executable, "-c", "pass"], check=True)
+        return (perf_counter() - start_time) * 1e3
+
+    return min(run_once() for _ in range(repeat))
+
+def parse_arguments() -> Namespace:
+    argument_parser: ArgumentParser = ArgumentParser(description=__doc__.split(": ", 1)[1])
+    argument_parser.add_argument("--days", type=int, nargs="+", default=None,
+                                 help="Day numbers to measure. Defaults to every Day N folder.")
+    argument_parser.add_argument("--repeat", type=int, default=3, help="Runs per day, the fastest is kept.")
+    argument_parser.add_argument("--budget-ms", type=float, default=None,
+                                 help="Fail (exit code 1) when a solution takes longer than this to import.")
+    argument_parser.add_argument("--json", dest="json_file_path", default=None,
+                                 help="Write machine-readable results to this path, or '-' for stdout in place of the table.")
+    return argument_parser.parse_args()
+
+def main() -> int:
+    arguments: Namespace = parse_arguments()
+    day_directories: Dict[int, str] = discover_days()
+    days: List[int] = arguments.days if arguments.days is not None else list(day_directories.keys())
+
+    results: Dict[str, Any] = {"interpreter_ms": interpreter_startup_ms(repeat=arguments.repeat), "budget_ms": arguments.budget_ms,
+                               "days": {day: measure_startup(day_directory=day_directories[day], repeat=arguments.repeat) for day in days}}
+    over_budget: List[int] = [day for day, measurement in results["days"].items()
+                              if arguments.budget_ms is not None and measurement["import_ms"] > arguments.budget_ms]
+    results["over_budget"] = over_budget
+
+    if arguments.json_file_path == "-":
+        print(dumps(results, indent=2))
+    else:
+        print(f"Interpreter startup: {results['interpreter_ms']:.1f} ms\n")
+        print(f"{'Day':>3} {'Import (ms)':>12} {'Process (ms)':>13}  Heaviest imports")
+        print("-" * 80)
+
+        for day, measurement in results["days"].items():
+            heaviest_imports: str = ", ".join(f"{heaviest['name']} {heaviest['ms']:.1f}" for heaviest in measurement["heaviest_imports"][:3])
+            budget_flag: str = " OVER BUDGET" if day in over_budget else ""
+            print(f"{day:>3} {measurement['import_ms']:>12.1f} {measurement['process_ms']:>13.1f}  {heaviest_imports}{budget_flag}")
+
+        if arguments.json_file_path is not None:
+            with open(arguments.json_file_path, "w") as json_file:
+                json_file.write(dumps(results, indent=2))
+
+    return 1 if len(over_budget) > 0 else 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,4 @@
+"""common: Shared tooling for the Advent of Code 2021 solutions"""
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
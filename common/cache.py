@@ -0,0 +1,192 @@
+"""cache.py: Content-addressed on-disk cache of puzzle answers with size-bounded LRU eviction"""
+from __future__ import annotations
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
+
+# Built-in modules
+from unittest import TestCase, main
+from hashlib import sha256
+from json import dumps, loads
+from os import listdir, makedirs, remove, replace, stat, utime, getpid
+from os.path import isfile, join, dirname, abspath
+from functools import lru_cache
+from tempfile import TemporaryDirectory
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIRECTORY: str = join(dirname(dirname(abspath(__file__))), ".cache", "answers")
+DEFAULT_MAXIMUM_BYTES: int = 16 * 1024 * 1024
+HASH_CHUNK_BYTES: int = 1024 * 1024
+ENTRY_SUFFIX: str = ".json"
+# Bump to invalidate every cached answer, e.g. when the meaning of an entry changes.
+CACHE_FORMAT_VERSION: int = 1
+COMMON_DIRECTORY: str = dirname(abspath(__file__))
+
+
+def file_sha256(file_path: str) -> str:
+    """SHA-256 of a file's bytes, read in fixed-size chunks so large inputs are never fully in memory."""
+    assert isfile(file_path), f"File not found: {file_path}"
+    file_hash = sha256()
+
+    with open(file_path, "rb") as hashed_file:
+        for chunk in iter(lambda: hashed_file.read(HASH_CHUNK_BYTES), b""):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+@lru_cache(maxsize=None)
+def common_version() -> str:
+    """Hash of the sources of every common module. Solutions parse and load through them, so any edit to one
+    invalidates the answers of every day."""
+    common_hash = sha256(f"format {CACHE_FORMAT_VERSION}".encode())
+
+    for file_name in sorted(listdir(COMMON_DIRECTORY)):
+        if file_name.endswith(".py"):
+            common_hash.update(f"{file_name} {file_sha256(join(COMMON_DIRECTORY, file_name))}".encode())
+
+    return common_hash.hexdigest()[:16]
+
+def solver_version(solution: ModuleType) -> str:
+    """Version of a solution module: its __version__ when defined, otherwise the hash of its source so that any
+    edit to the solver invalidates the answers it produced. Either way combined with common_version."""
+    return f"{getattr(solution, '__version__', None) or file_sha256(solution.__file__)[:16]}-{common_version()}"
+
+
+class ResultCache(object):
+    def __init__(self, cache_directory: str = DEFAULT_CACHE_DIRECTORY, maximum_bytes: int = DEFAULT_MAXIMUM_BYTES) -> None:
+        """Constructor.
+
+        Args:
+            cache_directory (str, optional): Folder holding one JSON file per answer. Defaults to DEFAULT_CACHE_DIRECTORY.
+            maximum_bytes (int, optional): Least recently used entries are evicted past this size. Defaults to 16 MiB."""
+        self.cache_directory: str = cache_directory
+        self.maximum_bytes: int = maximum_bytes
+        makedirs(cache_directory, exist_ok=True)
+
+    @staticmethod
+    def key(day: int, part: str, version: str, input_sha256: str) -> str:
+        return sha256(f"{day}|{part}|{version}|{input_sha256}".encode()).hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return join(self.cache_directory, key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Looks up an answer and marks the entry as recently used.
+
+        Returns:
+            Optional[Any]: The cached answer, None on a miss."""
+        try:
+            with open(self.entry_path(key)) as entry_file:
+                entry: Dict[str, Any] = loads(entry_file.read())
+            utime(self.entry_path(key))
+        except (FileNotFoundError, ValueError):
+            return None
+
+        return entry["answer"]
+
+    def put(self, key: str, answer: Any, **metadata: Any) -> None:
+        """Stores an answer, then evicts the least recently used entries beyond maximum_bytes. Entries are written to a
+        temporary file and renamed so concurrent readers never see partial JSON."""
+        temporary_path: str = self.entry_path(key) + f".{getpid()}.tmp"
+
+        with open(temporary_path, "w") as entry_file:
+            entry_file.write(dumps({"answer": answer, **metadata}))
+        replace(temporary_path, self.entry_path(key))
+
+        self.evict()
+
+    def evict(self) -> int:
+        """Removes least recently used entries until the cache fits in maximum_bytes.
+
+        Returns:
+            int: Number of entries removed."""
+        entries: List[Tuple[float, int, str]] = []
+
+        for file_name in listdir(self.cache_directory):
+            if file_name.endswith(ENTRY_SUFFIX):
+                try:
+                    file_stat = stat(join(self.cache_directory, file_name))
+                    entries.append((file_stat.st_mtime, file_stat.st_size, file_name))
+                except FileNotFoundError:
+                    continue
+
+        total_bytes: int = sum(size for _, size, _ in entries)
+        removed: int = 0
+
+        for _, size, file_name in sorted(entries):
+            if total_bytes <= self.maximum_bytes:
+                break
+
+            try:
+                remove(join(self.cache_directory, file_name))
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+        return removed
+
+
+class Tests(TestCase):
+    def test_get_put(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_get_put}")
+
+        with TemporaryDirectory() as temporary_directory:
+            result_cache: ResultCache = ResultCache(cache_directory=temporary_directory)
+            key: str = ResultCache.key(day=6, part="one", version="v1", input_sha256="0" * 64)
+
+            self.assertIsNone(result_cache.get(key))
+            result_cache.put(key, 5934, day=6, part="one")
+            self.assertEqual(result_cache.get(key), 5934)
+            self.assertNotEqual(key, ResultCache.key(day=6, part="one", version="v2", input_sha256="0" * 64))
+
+        print(f"Unittest {Tests.test_get_put} was successful.")
+
+    def test_lru_eviction(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_lru_eviction}")
+
+        with TemporaryDirectory() as temporary_directory:
+            result_cache: ResultCache = ResultCache(cache_directory=temporary_directory)
+            keys: List[str] = [ResultCache.key(day=day, part="one", version="v1", input_sha256="0" * 64) for day in range(3)]
+
+            for age, key in enumerate(keys):
+                result_cache.put(key, age)
+                # Explicit timestamps, the entries are written faster than the file system clock resolution.
+                utime(result_cache.entry_path(key), (age, age))
+
+            result_cache.maximum_bytes = 2 * stat(result_cache.entry_path(keys[0])).st_size
+            result_cache.get(keys[0])
+            self.assertEqual(result_cache.evict(), 1)
+            self.assertEqual(result_cache.get(keys[0]), 0)
+            self.assertIsNone(result_cache.get(keys[1]))
+            self.assertEqual(result_cache.get(keys[2]), 2)
+
+        print(f"Unittest {Tests.test_lru_eviction} was successful.")
+
+    def test_solver_version(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_solver_version}")
+
+        solution: ModuleType = ModuleType("solution")
+        solution.__version__ = "v1"
+        self.assertEqual(solver_version(solution), f"v1-{common_version()}")
+
+        # Editing a common module changes every solver's version.
+        global COMMON_DIRECTORY
+        common_directory: str = COMMON_DIRECTORY
+        with TemporaryDirectory() as temporary_directory:
+            COMMON_DIRECTORY = temporary_directory
+            versions: List[str] = []
+            for source in ("NEWLINE = 10\n", "NEWLINE = 13\n"):
+                with open(join(temporary_directory, "loader.py"), "w") as source_file:
+                    source_file.write(source)
+                common_version.cache_clear()
+                versions.append(solver_version(solution))
+            COMMON_DIRECTORY = common_directory
+            common_version.cache_clear()
+        self.assertNotEqual(versions[0], versions[1])
+
+        print(f"Unittest {Tests.test_solver_version} was successful.")
+
+if __name__ == "__main__":
+    main()
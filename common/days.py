@@ -0,0 +1,178 @@
+"""days.py: Discovery and entry points of the Day N solutions"""
+from __future__ import annotations
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
+
+# Built-in modules
+from unittest import TestCase, main
+from importlib.util import spec_from_file_location, module_from_spec
+from os.path import isfile, join, dirname, abspath, basename
+from glob import glob
+from pickle import dumps, loads
+from sys import modules
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Tuple
+
+REPOSITORY_DIRECTORY: str = dirname(dirname(abspath(__file__)))
+PARTS: List[str] = ["one", "two"]
+
+
+class DaySolver(object):
+    def __init__(self, load: Callable[[ModuleType, str, str], Any], solve: Dict[str, Callable[[ModuleType, Any], int]]) -> None:
+        """Constructor.
+
+        Args:
+            load (Callable[[ModuleType, str, str], Any]): Parses (solution module, input file path, part) into a puzzle.
+            solve (Dict[str, Callable[[ModuleType, Any], int]]): Part name to a callable answering (solution module, puzzle)."""
+        self.load: Callable[[ModuleType, str, str], Any] = load
+        self.solve: Dict[str, Callable[[ModuleType, Any], int]] = solve
+
+
+def _drive_submarine(solution: ModuleType, command_log: Tuple[Any, Any], part: str) -> int:
+    submarine = solution.Submarine()
+    direction_codes, units = command_log
+    submarine.perform_command_log(direction_codes=direction_codes, units=units, part=solution.PART(part))
+    return submarine.evaluate()
+
+def _score_bingo(bingo_subsystem: Any, part: Any) -> int:
+    winning_board, winning_draw = bingo_subsystem.run(part=part)
+    return winning_board.score(winning_draw=winning_draw)
+
+
+SOLVERS: Dict[int, DaySolver] = {
+    1: DaySolver(load=lambda solution, input_file_path, part: solution.read_input_file(input_file_path=input_file_path),
+                 solve={"one": lambda solution, depths: solution.count_window_increases(depths=depths, sliding_window_size=1),
+                        "two": lambda solution, depths: solution.count_window_increases(depths=depths, sliding_window_size=3)}),
+    2: DaySolver(load=lambda solution, input_file_path, part: solution.read_command_log(input_file_path=input_file_path),
+                 solve={"one": lambda solution, command_log: _drive_submarine(solution=solution, command_log=command_log, part="one"),
+                        "two": lambda solution, command_log: _drive_submarine(solution=solution, command_log=command_log, part="two")}),
+    3: DaySolver(load=lambda solution, input_file_path, part: solution.DiagnosticReport.load(diagnostic_report_file_path=input_file_path),
+                 solve={"one": lambda solution, diagnostic_report: diagnostic_report.power_consuption,
+                        "two": lambda solution, diagnostic_report: diagnostic_report.life_support_rating}),
+    4: DaySolver(load=lambda solution, input_file_path, part: solution.BingoSubsystem.load(puzzle_input_file_path=input_file_path),
+                 solve={"one": lambda solution, bingo_subsystem: _score_bingo(bingo_subsystem=bingo_subsystem, part=solution.PART.ONE),
+                        "two": lambda solution, bingo_subsystem: _score_bingo(bingo_subsystem=bingo_subsystem, part=solution.PART.TWO)}),
+    5: DaySolver(load=lambda solution, input_file_path, part: solution.Puzzle.load(puzzle_input_file_path=input_file_path, part=solution.PART(part)),
+                 solve={"one": lambda solution, puzzle: puzzle.evaluate(),
+                        "two": lambda solution, puzzle: puzzle.evaluate()}),
+    6: DaySolver(load=lambda solution, input_file_path, part: solution.LaternFishSchool.load(puzzle_input_file_path=input_file_path),
+                 solve={"one": lambda solution, latern_fish_school: latern_fish_school.run(days=80),
+                        "two": lambda solution, latern_fish_school: latern_fish_school.run(days=256)}),
+    7: DaySolver(load=lambda solution, input_file_path, part: solution.CrabSubmarines.load(puzzle_input_file_path=input_file_path),
+                 solve={"one": lambda solution, crab_submarines: crab_submarines.calculate_minimum_fuel_usage(part=solution.PART.ONE),
+                        "two": lambda solution, crab_submarines: crab_submarines.calculate_minimum_fuel_usage(part=solution.PART.TWO)}),
+    8: DaySolver(load=lambda solution, input_file_path, part: solution.Puzzle.load(puzzle_input_file_path=input_file_path),
+                 solve={"one": lambda solution, puzzle: puzzle.count_digits({solution.DIGIT.ONE, solution.DIGIT.FOUR, solution.DIGIT.SEVEN, solution.DIGIT.EIGHT}),
+                        "two": lambda solution, puzzle: puzzle.sum_displays()}),
+    9: DaySolver(load=lambda solution, input_file_path, part: solution.Cave.load(puzzle_input_file_path=input_file_path),
+                 solve={"one": lambda solution, cave: cave.get_minimum_risk_level(),
+                        "two": lambda solution, cave: cave.size_three_largest_basins()}),
+    10: DaySolver(load=lambda solution, input_file_path, part: solution.NavigationSubsystem.load(puzzle_input_file_path=input_file_path),
+                  solve={"one": lambda solution, navigation_subsystem: navigation_subsystem.get_corrupted_syntax_error_score(),
+                         "two": lambda solution, navigation_subsystem: navigation_subsystem.get_incomplete_syntax_error_score()}),
+    11: DaySolver(load=lambda solution, input_file_path, part: solution.OctopusConsortium.load(puzzle_input_file_path=input_file_path),
+                  solve={"one": lambda solution, octopus_consortium: octopus_consortium.pass_time(100),
+                         "two": lambda solution, octopus_consortium: octopus_consortium.find_first_syncronization()}),
+    12: DaySolver(load=lambda solution, input_file_path, part: solution.CaveSystem.load(puzzle_input_file_path=input_file_path),
+                  solve={"one": lambda solution, cave_system: cave_system.count_paths_that_visit_small_caves_at_most_n_times(n=1),
+                         "two": lambda solution, cave_system: cave_system.count_paths_that_visit_small_caves_at_most_n_times(n=2)})
+}
+
+
+def discover_days(repository_directory: str = REPOSITORY_DIRECTORY) -> Dict[int, str]:
+    """Finds every numbered Day N folder holding a solution.py. The Day x template is skipped.
+
+    Args:
+        repository_directory (str, optional): Folder holding the Day N folders. Defaults to REPOSITORY_DIRECTORY.
+
+    Returns:
+        Dict[int, str]: Day number to the directory of that day, sorted by day."""
+    day_directories: Dict[int, str] = {}
+
+    for solution_file_path in glob(join(repository_directory, "Day *", "solution.py")):
+        day_name: str = basename(dirname(solution_file_path))[len("Day "):]
+
+        if day_name.isdigit():
+            day_directories[int(day_name)] = dirname(solution_file_path)
+
+    return dict(sorted(day_directories.items()))
+
+def load_solution_module(day: int, repository_directory: str = REPOSITORY_DIRECTORY) -> ModuleType:
+    """Imports Day N/solution.py as module day_N_solution. Folder names contain spaces so the regular import
+    system cannot reach them.
+
+    Args:
+        day (int): Day number.
+        repository_directory (str, optional): Folder holding the Day N folders. Defaults to REPOSITORY_DIRECTORY.
+
+    Returns:
+        ModuleType: The imported solution module."""
+    module_name: str = f"day_{day}_solution"
+
+    if module_name in modules:
+        return modules[module_name]
+
+    solution_file_path: str = join(repository_directory, f"Day {day}", "solution.py")
+    assert isfile(solution_file_path), f"File not found: {solution_file_path}"
+
+    specification = spec_from_file_location(module_name, solution_file_path)
+    solution: ModuleType = module_from_spec(specification)
+    # Registered before execution, as the import system does. Only forked processes inherit the registration, pools
+    # started otherwise reach solution functions through SolutionFunction.
+    modules[module_name] = solution
+    specification.loader.exec_module(solution)
+
+    return solution
+
+class SolutionFunction(object):
+    def __init__(self, day: int, function_name: str, repository_directory: str = REPOSITORY_DIRECTORY) -> None:
+        """Constructor. Picklable reference to a module level function of a Day N solution, for process pools: workers
+        started by spawn or forkserver have no day_N_solution module to resolve a plain function reference against,
+        this one imports the solution from its file with load_solution_module on first call.
+
+        Args:
+            day (int): Day number.
+            function_name (str): Name of the function in the solution module.
+            repository_directory (str, optional): Folder holding the Day N folders. Defaults to REPOSITORY_DIRECTORY."""
+        self.day: int = day
+        self.function_name: str = function_name
+        self.repository_directory: str = repository_directory
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        solution: ModuleType = load_solution_module(day=self.day, repository_directory=self.repository_directory)
+        return getattr(solution, self.function_name)(*args, **kwargs)
+
+def input_file_path(day: int, input_name: str = "input.txt", repository_directory: str = REPOSITORY_DIRECTORY) -> str:
+    return join(repository_directory, f"Day {day}", input_name)
+
+
+class Tests(TestCase):
+    def test_discover_days(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_discover_days}")
+
+        day_directories: Dict[int, str] = discover_days()
+        self.assertEqual(list(day_directories.keys()), sorted(SOLVERS.keys()))
+
+        print(f"Unittest {Tests.test_discover_days} was successful.")
+
+    def test_load_solution_module(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_load_solution_module}")
+
+        solution: ModuleType = load_solution_module(day=6)
+        latern_fish_school = SOLVERS[6].load(solution, input_file_path(day=6, input_name="example.txt"), "one")
+        self.assertEqual(SOLVERS[6].solve["one"](solution, latern_fish_school), 5934)
+
+        print(f"Unittest {Tests.test_load_solution_module} was successful.")
+
+    def test_solution_function(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_solution_function}")
+
+        # Pickled by value, whether the solution module exists in the unpickling process or not.
+        count_increases: SolutionFunction = loads(dumps(SolutionFunction(day=1, function_name="count_depth_measurement_increases")))
+        self.assertEqual(count_increases(input_file_path=input_file_path(day=1, input_name="example.txt")), 7)
+
+        print(f"Unittest {Tests.test_solution_function} was successful.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""generators.py: Seeded synthetic puzzle input generators for every day of Advent of Code 2021"""
+from __future__ import annotations
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
+
+# Built-in modules
+from unittest import TestCase, main
+from math import sqrt
+from os.path import join
+from tempfile import TemporaryDirectory
+from typing import Callable, Dict, List
+
+# 3rd Party modules
+from numpy import array, arange, cumsum, where, char
+from numpy.random import Generator, default_rng
+
+# Local modules
+from common.days import SOLVERS, load_solution_module
+
+# Seven segment wiring of the digits 0-9 used by Day 8.
+DIGIT_SEGMENTS: List[str] = ["abcefg", "cf", "acdeg", "acdfg", "bcdf", "abdfg", "abdefg", "acf", "abcdefg", "abcdfg"]
+BRACKET_PAIRS: List[str] = ["()", "[]", "{}", "<>"]
+
+
+def _join_lines(lines: List[str]) -> str:
+    return "\n".join(lines) + "\n"
+
+def _grid_side(base_side: int, scale: int) -> int:
+    """Side length of a square grid holding scale times the cells of a base_side grid."""
+    return max(2, int(round(base_side * sqrt(scale))))
+
+def generate_day_1(scale: int, random_generator: Generator) -> str:
+    """Sonar sweep depths: a slowly rising random walk, 2000 readings per scale."""
+    depths: array = 100 + cumsum(random_generator.integers(-5, 10, size=2000 * scale))
+    return _join_lines(depths.astype(str).tolist())
+
+def generate_day_2(scale: int, random_generator: Generator) -> str:
+    """Submarine commands "<direction> <units>", 1000 per scale. Downs outweigh ups so depth stays positive."""
+    directions: array = random_generator.choice(array(["forward", "down", "up"]), p=[0.4, 0.35, 0.25], size=1000 * scale)
+    units: array = random_generator.integers(1, 10, size=1000 * scale)
+    return _join_lines(char.add(char.add(directions, " "), units.astype(str)).tolist())
+
+def generate_day_3(scale: int, random_generator: Generator, width: int = 12) -> str:
+    """Diagnostic report of width-bit binary strings, 1000 per scale."""
+    bits: array = random_generator.integers(0, 2, size=(1000 * scale, width))
+    return _join_lines(["".join(row) for row in bits.astype(str).tolist()])
+
+def generate_day_4(scale: int, random_generator: Generator, puzzle_size: int = 5) -> str:
+    """Draw order over 0-99 followed by 100 bingo boards per scale, each board followed by a blank line."""
+    draw_order: array = random_generator.permutation(100)
+    lines: List[str] = [",".join(draw_order.astype(str).tolist()), ""]
+
+    for _ in range(100 * scale):
+        board: array = random_generator.choice(100, size=(puzzle_size, puzzle_size), replace=False)
+
+        for row in board.tolist():
+            lines.append(" ".join(f"{value:>2}" for value in row))
+        lines.append("")
+
+    return _join_lines(lines)
+
+def generate_day_5(scale: int, random_generator: Generator, grid_size: int = 1000) -> str:
+    """Hydrothermal vent lines "x1,y1 -> x2,y2", 500 per scale split between horizontal, vertical and 45 degree lines."""
+    line_count: int = 500 * scale
+    x1: array = random_generator.integers(0, grid_size, size=line_count)
+    y1: array = random_generator.integers(0, grid_size, size=line_count)
+    length: array = random_generator.integers(-grid_size // 2, grid_size // 2, size=line_count)
+    orientation: array = random_generator.integers(0, 3, size=line_count)
+
+    x2: array = where(orientation == 1, x1, (x1 + length).clip(0, grid_size - 1))
+    # Diagonals move the same distance along both axes, clipped back inside the grid.
+    diagonal_length: array = x2 - x1
+    diagonal_direction: array = random_generator.choice(array([-1, 1]), size=line_count)
+    y2: array = where(orientation == 0, y1,
+                      where(orientation == 1, (y1 + length).clip(0, grid_size - 1), y1 + diagonal_direction * diagonal_length))
+    out_of_bounds: array = (y2 < 0) | (y2 >= grid_size)
+    y2 = where(out_of_bounds & (orientation == 2), y1 - diagonal_direction * diagonal_length, y2)
+    still_out_of_bounds: array = (y2 < 0) | (y2 >= grid_size)
+    x2 = where(still_out_of_bounds, x1, x2)
+    y2 = where(still_out_of_bounds, y1, y2)
+
+    return _join_lines([f"{a},{b} -> {c},{d}" for a, b, c, d in zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist())])
+
+def generate_day_6(scale: int, random_generator: Generator) -> str:
+    """Comma separated latern fish timers in 1-5, 300 per scale, without a trailing newline."""
+    return ",".join(random_generator.integers(1, 6, size=300 * scale).astype(str).tolist())
+
+def generate_day_7(scale: int, random_generator: Generator) -> str:
+    """Comma separated crab positions, 1000 per scale, skewed toward low positions."""
+    positions: array = random_generator.exponential(scale=400, size=1000 * scale).astype(int)
+    return ",".join(positions.astype(str).tolist()) + "\n"
+
+def generate_day_8(scale: int, random_generator: Generator) -> str:
+    """Scrambled seven segment displays, 200 per scale: ten unique signal patterns | four output values."""
+    lines: List[str] = []
+
+    for _ in range(200 * scale):
+        wiring: Dict[str, str] = dict(zip("abcdefg", random_generator.permutation(list("abcdefg")).tolist()))
+        patterns: List[str] = ["".join(random_generator.permutation([wiring[segment] for segment in segments]).tolist())
+                               for segments in DIGIT_SEGMENTS]
+        signal_patterns: List[str] = [patterns[digit] for digit in random_generator.permutation(10).tolist()]
+        output_patterns: List[str] = ["".join(random_generator.permutation(list(patterns[digit])).tolist())
+                                      for digit in random_generator.integers(0, 10, size=4).tolist()]
+        lines.append(f"{' '.join(signal_patterns)} | {' '.join(output_patterns)}")
+
+    return _join_lines(lines)
+
+def generate_day_9(scale: int, random_generator: Generator, basin_spacing: int = 8) -> str:
+    """Height map with scale times the cells of a 100x100 map. Walls of 9 every basin_spacing cells keep basins small."""
+    side: int = _grid_side(100, scale)
+    heights: array = random_generator.integers(0, 9, size=(side, side))
+    heights[arange(side) % basin_spacing == basin_spacing - 1, :] = 9
+    heights[:, arange(side) % basin_spacing == basin_spacing - 1] = 9
+    return _join_lines(["".join(row) for row in heights.astype(str).tolist()])
+
+def generate_day_10(scale: int, random_generator: Generator, line_length: int = 100) -> str:
+    """Navigation subsystem lines, ~100 per scale, roughly half corrupted and half incomplete."""
+    open_brackets: str = "".join(pair[0] for pair in BRACKET_PAIRS)
+    closing_brackets: Dict[str, str] = {pair[0]: pair[1] for pair in BRACKET_PAIRS}
+    lines: List[str] = []
+
+    for _ in range(100 * scale):
+        corrupt_at: int = int(random_generator.integers(line_length // 2, line_length)) if random_generator.random() < 0.5 else -1
+        line: List[str] = []
+        stack: List[str] = []
+
+        for position in range(line_length):
+            if position == corrupt_at and stack:
+                line.append(random_generator.choice([closing for closing in closing_brackets.values() if closing != closing_brackets[stack[-1]]]))
+                break
+            elif stack and random_generator.random() < 0.45:
+                line.append(closing_brackets[stack.pop()])
+            else:
+                stack.append(open_brackets[int(random_generator.integers(0, 4))])
+                line.append(stack[-1])
+
+        if not stack:
+            line.append(open_brackets[int(random_generator.integers(0, 4))])
+
+        lines.append("".join(line))
+
+    return _join_lines(lines)
+
+def generate_day_11(scale: int, random_generator: Generator) -> str:
+    """Octopus energy levels with scale times the cells of a 10x10 grid."""
+    side: int = _grid_side(10, scale)
+    energies: array = random_generator.integers(0, 10, size=(side, side))
+    return _join_lines(["".join(row) for row in energies.astype(str).tolist()])
+
+def generate_day_12(scale: int, random_generator: Generator) -> str:
+    """Cave connections "a-b" with 6 small and 3 big caves per scale. Big caves are never adjacent to each other,
+    otherwise the number of paths would be infinite."""
+    small_caves: List[str] = [f"s{index}" for index in range(6 * scale)]
+    big_caves: List[str] = [f"B{index}" for index in range(3 * scale)]
+    connections: List[str] = []
+
+    for small_cave in small_caves:
+        for neighbour in random_generator.choice(small_caves + big_caves, size=2, replace=False).tolist():
+            if neighbour != small_cave:
+                connections.append(f"{small_cave}-{neighbour}")
+
+    for cave in random_generator.choice(small_caves + big_caves, size=2, replace=False).tolist():
+        connections.append(f"start-{cave}")
+    for cave in random_generator.choice(small_caves + big_caves, size=2, replace=False).tolist():
+        connections.append(f"{cave}-end")
+
+    return _join_lines(connections)
+
+
+GENERATORS: Dict[int, Callable[[int, Generator], str]] = {
+    1: generate_day_1, 2: generate_day_2, 3: generate_day_3, 4: generate_day_4,
+    5: generate_day_5, 6: generate_day_6, 7: generate_day_7, 8: generate_day_8,
+    9: generate_day_9, 10: generate_day_10, 11: generate_day_11, 12: generate_day_12
+}
+
+
+def generate_input(day: int, scale: int = 1, seed: int = 2021) -> str:
+    """Generates a synthetic puzzle input roughly scale times the size of the real input.
+
+    Args:
+        day (int): Day number.
+        scale (int, optional): Size multiplier relative to the real puzzle input. Defaults to 1.
+        seed (int, optional): Random seed. The same (day, scale, seed) always generates the same input. Defaults to 2021.
+
+    Returns:
+        str: Puzzle input text in the format parsed by the day's load method."""
+    assert day in GENERATORS, f"No generator for day {day}"
+    assert scale >= 1, f"Scale must be positive: {scale}"
+    return GENERATORS[day](scale, default_rng(seed))
+
+def write_input(day: int, file_path: str, scale: int = 1, seed: int = 2021) -> int:
+    """Writes generate_input(day, scale, seed) to file_path.
+
+    Returns:
+        int: Number of bytes written."""
+    puzzle_input: str = generate_input(day=day, scale=scale, seed=seed)
+
+    with open(file_path, "w") as puzzle_input_file:
+        puzzle_input_file.write(puzzle_input)
+
+    return len(puzzle_input)
+
+
+class Tests(TestCase):
+    def test_generate_input_is_seeded(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_generate_input_is_seeded}")
+
+        for day in GENERATORS:
+            self.assertEqual(generate_input(day=day, scale=2, seed=7), generate_input(day=day, scale=2, seed=7))
+
+        print(f"Unittest {Tests.test_generate_input_is_seeded} was successful.")
+
+    def test_generated_inputs_load(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_generated_inputs_load}")
+
+        with TemporaryDirectory() as temporary_directory:
+            for day in GENERATORS:
+                if day in (11, 12):
+                    # Random octopus grids need not ever synchronize and random cave systems can have exponentially
+                    # many paths.
+                    continue
+
+                file_path: str = join(temporary_directory, f"day_{day}.txt")
+                write_input(day=day, file_path=file_path, scale=1)
+                solution = load_solution_module(day=day)
+
+                for part, solve in SOLVERS[day].solve.items():
+                    self.assertIsNotNone(solve(solution, SOLVERS[day].load(solution, file_path, part)))
+
+        print(f"Unittest {Tests.test_generated_inputs_load} was successful.")
+
+if __name__ == "__main__":
+    main()
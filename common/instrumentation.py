@@ -0,0 +1,225 @@
+"""instrumentation.py: Per-phase wall time, call count and tracemalloc peak recording for the solutions"""
+from __future__ import annotations
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
+
+# Built-in modules
+from unittest import TestCase, main
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from json import dumps
+from os import environ
+from time import perf_counter
+from tracemalloc import is_tracing, start, get_traced_memory, reset_peak
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+# Instrumentation is decided when a function is decorated: set AOC_INSTRUMENT=1 or call enable() before the solutions
+# are imported. Disabled, instrument returns the function untouched and phase a shared null context.
+INSTRUMENTATION_ENABLED: bool = environ.get("AOC_INSTRUMENT", "0") == "1"
+# Memory tracing slows allocations down noticeably, AOC_INSTRUMENT_MEMORY=0 records time and calls only.
+MEMORY_TRACING_ENABLED: bool = environ.get("AOC_INSTRUMENT_MEMORY", "1") == "1"
+NULL_PHASE: ContextManager[None] = nullcontext()
+
+
+class PhaseRecord(object):
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.total_seconds: float = 0.
+        self.child_seconds: float = 0.
+        self.peak_bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "total_seconds": self.total_seconds,
+                "self_seconds": self.total_seconds - self.child_seconds, "peak_bytes": self.peak_bytes}
+
+
+class _Frame(object):
+    def __init__(self, stack: Tuple[str, ...], start_bytes: int) -> None:
+        self.stack: Tuple[str, ...] = stack
+        self.start_time: float = perf_counter()
+        self.start_bytes: int = start_bytes
+        # Highest traced memory seen by this phase, including peaks hidden by reset_peak calls of its children.
+        self.maximum_bytes: int = start_bytes
+        self.child_seconds: float = 0.
+
+
+class Instrumentation(object):
+    def __init__(self) -> None:
+        """Constructor. Records are keyed by the stack of phase names leading to them, e.g. ("run", "check_draw")."""
+        self.records: Dict[Tuple[str, ...], PhaseRecord] = {}
+        self.frames: List[_Frame] = []
+
+    def reset(self) -> None:
+        self.records = {}
+        self.frames = []
+
+    def enter(self, name: str) -> None:
+        start_bytes: int = 0
+
+        if MEMORY_TRACING_ENABLED:
+            if not is_tracing():
+                start()
+
+            start_bytes, peak_bytes = get_traced_memory()
+            if self.frames:
+                self.frames[-1].maximum_bytes = max(self.frames[-1].maximum_bytes, peak_bytes)
+            reset_peak()
+
+        parent_stack: Tuple[str, ...] = self.frames[-1].stack if self.frames else ()
+        self.frames.append(_Frame(stack=parent_stack + (name,), start_bytes=start_bytes))
+
+    def exit(self) -> None:
+        frame: _Frame = self.frames.pop()
+        elapsed_seconds: float = perf_counter() - frame.start_time
+        record: PhaseRecord = self.records.setdefault(frame.stack, PhaseRecord())
+        record.calls += 1
+        record.total_seconds += elapsed_seconds
+        record.child_seconds += frame.child_seconds
+
+        if MEMORY_TRACING_ENABLED:
+            maximum_bytes: int = max(get_traced_memory()[1], frame.maximum_bytes)
+            record.peak_bytes = max(record.peak_bytes, maximum_bytes - frame.start_bytes)
+
+            if self.frames:
+                self.frames[-1].maximum_bytes = max(self.frames[-1].maximum_bytes, maximum_bytes)
+
+        if self.frames:
+            self.frames[-1].child_seconds += elapsed_seconds
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Returns:
+            List[Dict[str, Any]]: One entry per phase stack: stack ("run;check_draw"), calls, total_seconds,
+                self_seconds and peak_bytes (tracemalloc peak above the memory in use when the phase started)."""
+        return [{"stack": ";".join(stack), **record.to_dict()} for stack, record in sorted(self.records.items())]
+
+    def export_json(self, file_path: str) -> None:
+        with open(file_path, "w") as json_file:
+            json_file.write(dumps(self.report(), indent=2))
+
+    def export_collapsed(self, file_path: str, prefix: str = "") -> None:
+        """Writes the phases in the collapsed stack format read by flamegraph.pl and speedscope: one
+        "outer;inner <self microseconds>" line per stack."""
+        with open(file_path, "w") as collapsed_file:
+            collapsed_file.write(collapsed_stacks(self.report(), prefix=prefix))
+
+
+INSTRUMENTATION: Instrumentation = Instrumentation()
+
+
+def enable() -> None:
+    """Turns instrumentation on for every function decorated from now on, in this process and in the processes it
+    starts: they inherit AOC_INSTRUMENT whether they are forked or spawned."""
+    global INSTRUMENTATION_ENABLED
+    INSTRUMENTATION_ENABLED = True
+    environ["AOC_INSTRUMENT"] = "1"
+
+def is_enabled() -> bool:
+    return INSTRUMENTATION_ENABLED
+
+def collapsed_stacks(report: List[Dict[str, Any]], prefix: str = "") -> str:
+    return "".join(f"{prefix}{entry['stack']} {max(int(entry['self_seconds'] * 1e6), 0)}\n" for entry in report)
+
+@contextmanager
+def _recorded_phase(name: str) -> Iterator[None]:
+    INSTRUMENTATION.enter(name)
+    try:
+        yield
+    finally:
+        INSTRUMENTATION.exit()
+
+def phase(name: str) -> ContextManager[None]:
+    """Context manager recording the enclosed block as a phase, e.g. with phase("parse"): ..."""
+    return _recorded_phase(name) if INSTRUMENTATION_ENABLED else NULL_PHASE
+
+def instrument(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorator recording every call of the function as a phase named name, by default after the function.
+    Disabled, the function is returned as is, so decorated inner loops cost nothing."""
+    def decorator(function: Callable) -> Callable:
+        if not INSTRUMENTATION_ENABLED:
+            return function
+
+        # Class.method for methods, the bare name for functions nested in other functions.
+        phase_name: str = name or function.__qualname__.split("<locals>.")[-1]
+
+        @wraps(function)
+        def instrumented(*args: Any, **kwargs: Any) -> Any:
+            INSTRUMENTATION.enter(phase_name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                INSTRUMENTATION.exit()
+
+        return instrumented
+
+    return decorator
+
+
+class Tests(TestCase):
+    def test_disabled_is_free(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_disabled_is_free}")
+        global INSTRUMENTATION_ENABLED
+        enabled: bool = INSTRUMENTATION_ENABLED
+        INSTRUMENTATION_ENABLED = False
+
+        def solve() -> int:
+            return 1
+
+        self.assertIs(instrument()(solve), solve)
+        self.assertIs(phase("load"), NULL_PHASE)
+        INSTRUMENTATION_ENABLED = enabled
+
+        print(f"Unittest {Tests.test_disabled_is_free} was successful.")
+
+    def test_enable(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_enable}")
+        global INSTRUMENTATION_ENABLED
+        enabled: bool = INSTRUMENTATION_ENABLED
+        environment: Optional[str] = environ.get("AOC_INSTRUMENT")
+
+        enable()
+        self.assertTrue(is_enabled())
+        self.assertEqual(environ["AOC_INSTRUMENT"], "1")
+
+        INSTRUMENTATION_ENABLED = enabled
+        if environment is None:
+            del environ["AOC_INSTRUMENT"]
+        else:
+            environ["AOC_INSTRUMENT"] = environment
+
+        print(f"Unittest {Tests.test_enable} was successful.")
+
+    def test_records(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_records}")
+        global INSTRUMENTATION_ENABLED
+        enabled: bool = INSTRUMENTATION_ENABLED
+        INSTRUMENTATION_ENABLED = True
+        INSTRUMENTATION.reset()
+
+        @instrument()
+        def inner_loop(size: int) -> List[int]:
+            return list(range(size))
+
+        @instrument(name="solve")
+        def solve() -> int:
+            with phase("allocate"):
+                allocation: List[int] = inner_loop(100000)
+            return len(allocation) + len(inner_loop(10))
+
+        self.assertEqual(solve(), 100010)
+        INSTRUMENTATION_ENABLED = enabled
+
+        records: Dict[str, Dict[str, Any]] = {entry["stack"]: entry for entry in INSTRUMENTATION.report()}
+        self.assertEqual(set(records.keys()), {"solve", "solve;allocate", "solve;allocate;inner_loop", "solve;inner_loop"})
+        self.assertEqual(records["solve"]["calls"], 1)
+        self.assertGreaterEqual(records["solve"]["total_seconds"], records["solve;allocate"]["total_seconds"])
+        if MEMORY_TRACING_ENABLED:
+            # A list of 100000 ints needs well over 800kB, and the peak propagates to the enclosing phases.
+            self.assertGreater(records["solve;allocate;inner_loop"]["peak_bytes"], 800000)
+            self.assertGreaterEqual(records["solve"]["peak_bytes"], records["solve;allocate;inner_loop"]["peak_bytes"])
+        self.assertIn("solve;allocate;inner_loop ", collapsed_stacks(INSTRUMENTATION.report()))
+
+        print(f"Unittest {Tests.test_records} was successful.")
+
+if __name__ == "__main__":
+    main()
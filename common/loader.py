@@ -0,0 +1,153 @@
+"""loader.py: Memory-mapped numeric puzzle input loading straight into compact NumPy arrays"""
+from __future__ import annotations
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
+
+# Built-in modules
+from unittest import TestCase, main
+from mmap import mmap, ACCESS_READ
+from os.path import isfile, getsize, join, dirname
+from typing import Union
+
+# 3rd Party modules
+from numpy import array, uint8, int8, int32, int64, frombuffer, flatnonzero, zeros, diff, where, dtype as DType
+from numpy.lib.stride_tricks import as_strided
+
+NEWLINE: int = ord("\n")
+CARRIAGE_RETURN: int = ord("\r")
+MINUS: int = ord("-")
+ZERO: int = ord("0")
+# Longest digit run that still fits an int64 accumulator.
+MAXIMUM_DIGITS: int = 18
+
+
+def map_file(file_path: str) -> array:
+    """Memory-maps file_path read only and views it as a uint8 array without copying.
+
+    Args:
+        file_path (str): relative or absolute path to the file.
+
+    Returns:
+        array: uint8 view over the file bytes. The mapping lives as long as the array does."""
+    assert isfile(file_path), f"File not found: {file_path}"
+
+    if getsize(file_path) == 0:
+        return zeros(0, dtype=uint8)
+
+    with open(file_path, "rb") as mapped_file:
+        return frombuffer(mmap(mapped_file.fileno(), 0, access=ACCESS_READ), dtype=uint8)
+
+def decode_digit_grid(buffer: Union[bytes, array]) -> array:
+    """Decodes lines of single digits ("2199943210\\n...") into a 2d uint8 array. Every line is viewed in place with
+    strides and a single vectorized subtraction produces the result.
+
+    Args:
+        buffer (Union[bytes, array]): Raw file bytes. \\n and \\r\\n line endings are accepted, the final newline is optional.
+
+    Returns:
+        array: uint8 array of shape (lines, line width)."""
+    buffer = frombuffer(buffer, dtype=uint8) if isinstance(buffer, bytes) else buffer
+    newlines: array = flatnonzero(buffer == NEWLINE)
+    digits: array = flatnonzero((buffer - ZERO) < 10)
+
+    if len(digits) == 0:
+        return zeros((0, 0), dtype=uint8)
+
+    # Trailing whitespace does not belong to any row.
+    end: int = digits[-1] + 1
+    line_length: int = newlines[0] if len(newlines) > 0 and newlines[0] < end else end
+    width: int = line_length - 1 if line_length > 0 and buffer[line_length - 1] == CARRIAGE_RETURN else line_length
+    stride: int = line_length + 1
+    rows: int = (end + stride - width) // stride
+    assert (rows - 1) * stride + width == end, "Digit grid lines are not all the same width"
+
+    grid: array = as_strided(buffer, shape=(rows, width), strides=(stride, 1), writeable=False) - uint8(ZERO)
+    assert (grid < 10).all(), "Digit grid holds characters other than digits"
+    return grid
+
+def decode_integers(buffer: Union[bytes, array], dtype: DType = int32) -> array:
+    """Decodes every (optionally negative) integer in buffer, whatever separates them: "3,4,3,1,2", one per line,
+    "forward 5" or "0,9 -> 5,9". Runs of digits are located and accumulated with byte arithmetic, no Python object is
+    created per value.
+
+    Args:
+        buffer (Union[bytes, array]): Raw file bytes.
+        dtype (DType, optional): Result dtype. Defaults to int32.
+
+    Returns:
+        array: One value per run of digits, in file order."""
+    buffer = frombuffer(buffer, dtype=uint8) if isinstance(buffer, bytes) else buffer
+    digits: array = buffer - uint8(ZERO)
+
+    # +1 where a run of digits starts, -1 one past where it ends.
+    padded: array = zeros(len(buffer) + 2, dtype=int8)
+    padded[1:-1] = digits < 10
+    edges: array = diff(padded)
+    starts: array = flatnonzero(edges == 1)
+    lengths: array = flatnonzero(edges == -1) - starts
+
+    if len(starts) == 0:
+        return zeros(0, dtype=dtype)
+
+    assert lengths.max() <= MAXIMUM_DIGITS, f"Integers longer than {MAXIMUM_DIGITS} digits are not supported"
+
+    # Horner's rule across all runs at once, one pass per digit place.
+    values: array = zeros(len(starts), dtype=int64)
+    positions: array = starts.copy()
+    shortest: int = lengths.min()
+    for place in range(lengths.max()):
+        if place < shortest:
+            values *= 10
+            values += digits[positions]
+        else:
+            values = where(lengths > place, values * 10 + digits[positions], values)
+        # Positions stop on the last digit of their run so they never leave the buffer.
+        positions += lengths > place + 1
+
+    negative: array = (starts > 0) & (buffer[starts - 1] == MINUS)
+    values[negative] *= -1
+
+    return values.astype(dtype, copy=False)
+
+def load_digit_grid(file_path: str) -> array:
+    """Memory-maps file_path and decodes it with decode_digit_grid."""
+    return decode_digit_grid(map_file(file_path))
+
+def load_integers(file_path: str, dtype: DType = int32) -> array:
+    """Memory-maps file_path and decodes it with decode_integers."""
+    return decode_integers(map_file(file_path), dtype=dtype)
+
+
+class Tests(TestCase):
+    def test_decode_digit_grid(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_decode_digit_grid}")
+
+        expected: array = array([[2, 1, 9], [3, 9, 8]], dtype=uint8)
+        for buffer in [b"219\n398\n", b"219\n398", b"219\r\n398\r\n", b"219\n398\n\n"]:
+            grid: array = decode_digit_grid(buffer)
+            self.assertEqual(grid.dtype, uint8)
+            self.assertTrue((grid == expected).all())
+
+        height_map: array = load_digit_grid(join(dirname(dirname(__file__)), "Day 9", "example.txt"))
+        self.assertEqual(height_map.shape, (5, 10))
+        self.assertEqual(height_map[0, 0], 2)
+
+        print(f"Unittest {Tests.test_decode_digit_grid} was successful.")
+
+    def test_decode_integers(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_decode_integers}")
+
+        self.assertEqual(decode_integers(b"16,1,2,0,4,2,7,1,2,14\n").tolist(), [16, 1, 2, 0, 4, 2, 7, 1, 2, 14])
+        self.assertEqual(decode_integers(b"forward 5\ndown 15\nup -3").tolist(), [5, 15, -3])
+        self.assertEqual(decode_integers(b"0,9 -> 5,9\n").tolist(), [0, 9, 5, 9])
+        self.assertEqual(decode_integers(b"").tolist(), [])
+        self.assertEqual(decode_integers(b"123456789012", dtype=int64).tolist(), [123456789012])
+
+        depths: array = load_integers(join(dirname(dirname(__file__)), "Day 1", "example.txt"))
+        self.assertEqual(depths.tolist(), [199, 200, 208, 210, 200, 207, 240, 269, 260, 263])
+
+        print(f"Unittest {Tests.test_decode_integers} was successful.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""snapshot.py: Binary snapshots of parsed puzzle inputs stored next to the input and memory-mapped back on reuse"""
+from __future__ import annotations
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
+
+# Built-in modules
+from unittest import TestCase, main
+from json import dumps, loads
+from os import environ, getpid, replace, stat, utime
+from os.path import isfile, join, dirname, basename
+from pickle import dump, load, HIGHEST_PROTOCOL
+from sys import modules
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Dict, List, Optional
+
+# 3rd Party modules
+from numpy import ndarray, save, load as load_array, memmap
+
+# Local modules
+from common.cache import file_sha256, common_version
+from common.loader import load_integers
+
+# Set AOC_SNAPSHOTS=0 to always parse the text input.
+SNAPSHOTS_ENABLED: bool = environ.get("AOC_SNAPSHOTS", "1") != "0"
+
+
+def snapshot_path(input_file_path: str, name: str, suffix: str) -> str:
+    """Sidecar path: Day 9/input.txt with name digit_grid becomes Day 9/.input.txt.digit_grid<suffix>."""
+    return join(dirname(input_file_path), f".{basename(input_file_path)}.{name}{suffix}")
+
+def parser_identity(parse: Callable[[str], Any], version: Optional[str] = None) -> str:
+    """Identity of the parser a snapshot was produced by: its qualified name, version (by default the hash of the
+    source of the module defining it) and the version of the common modules parsers rely on."""
+    module_file_path: Optional[str] = getattr(modules.get(parse.__module__), "__file__", None)
+    version = version or (file_sha256(module_file_path)[:16] if module_file_path and isfile(module_file_path) else "")
+    return f"{parse.__qualname__}|{version}|{common_version()}"
+
+def _read_metadata(metadata_file_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(metadata_file_path) as metadata_file:
+            return loads(metadata_file.read())
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _write_atomically(file_path: str, write: Callable[[Any], None], mode: str = "wb") -> None:
+    temporary_path: str = f"{file_path}.{getpid()}.tmp"
+
+    with open(temporary_path, mode) as temporary_file:
+        write(temporary_file)
+    replace(temporary_path, file_path)
+
+def load_snapshot(input_file_path: str, name: str, parse: Callable[[str], Any], version: Optional[str] = None) -> Any:
+    """Returns parse(input_file_path), reusing the snapshot stored by a previous call when the input and the parser
+    are unchanged.
+
+    A snapshot is valid when it was produced by the same parser (see parser_identity) and the input's mtime and size
+    match the ones recorded with it. When they differ the input is hashed and a matching SHA-256 revalidates the
+    snapshot (the file was only touched); otherwise it is parsed again.
+    Arrays are stored as .npy and memory-mapped back copy-on-write, so loading costs the same whatever the input size
+    and callers may still modify the result in memory. Anything else is pickled.
+
+    Args:
+        input_file_path (str): relative or absolute path to the puzzle input file.
+        name (str): Name of the parsed representation. Different parsers of the same input need different names.
+        parse (Callable[[str], Any]): Parser of the input file.
+        version (Optional[str], optional): Version of parse. Defaults to the hash of the source of its module.
+
+    Returns:
+        Any: The parsed input."""
+    assert isfile(input_file_path), f"File not found: {input_file_path}"
+
+    if not SNAPSHOTS_ENABLED:
+        return parse(input_file_path)
+
+    metadata_file_path: str = snapshot_path(input_file_path, name, ".snapshot.json")
+    metadata: Optional[Dict[str, Any]] = _read_metadata(metadata_file_path)
+    input_stat = stat(input_file_path)
+    input_sha256: Optional[str] = None
+    parser: str = parser_identity(parse, version=version)
+
+    if metadata is not None and metadata.get("parser") == parser and isfile(snapshot_path(input_file_path, name, metadata["suffix"])):
+        valid: bool = metadata["mtime_ns"] == input_stat.st_mtime_ns and metadata["size"] == input_stat.st_size
+
+        if not valid:
+            input_sha256 = file_sha256(input_file_path)
+            valid = metadata["sha256"] == input_sha256
+
+            if valid:
+                metadata.update(mtime_ns=input_stat.st_mtime_ns, size=input_stat.st_size)
+                _write_atomically(metadata_file_path, lambda metadata_file: metadata_file.write(dumps(metadata)), mode="w")
+
+        if valid:
+            data_file_path: str = snapshot_path(input_file_path, name, metadata["suffix"])
+
+            if metadata["suffix"] == ".npy":
+                return load_array(data_file_path, mmap_mode="c")
+
+            with open(data_file_path, "rb") as data_file:
+                return load(data_file)
+
+    parsed: Any = parse(input_file_path)
+    suffix: str = ".npy" if isinstance(parsed, ndarray) else ".pickle"
+
+    if suffix == ".npy":
+        _write_atomically(snapshot_path(input_file_path, name, suffix), lambda data_file: save(data_file, parsed))
+    else:
+        _write_atomically(snapshot_path(input_file_path, name, suffix), lambda data_file: dump(parsed, data_file, protocol=HIGHEST_PROTOCOL))
+
+    metadata = {"mtime_ns": input_stat.st_mtime_ns, "size": input_stat.st_size, "suffix": suffix,
+                "sha256": input_sha256 or file_sha256(input_file_path), "parser": parser}
+    _write_atomically(metadata_file_path, lambda metadata_file: metadata_file.write(dumps(metadata)), mode="w")
+
+    return parsed
+
+
+class Tests(TestCase):
+    def test_load_snapshot(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_load_snapshot}")
+        parse_calls: List[str] = []
+
+        def parse(file_path: str) -> ndarray:
+            parse_calls.append(file_path)
+            return load_integers(file_path)
+
+        with TemporaryDirectory() as temporary_directory:
+            input_file_path: str = join(temporary_directory, "input.txt")
+            with open(input_file_path, "w") as input_file:
+                input_file.write("3,4,3,1,2\n")
+
+            self.assertEqual(load_snapshot(input_file_path, "fish", parse).tolist(), [3, 4, 3, 1, 2])
+            reloaded: ndarray = load_snapshot(input_file_path, "fish", parse)
+            self.assertIsInstance(reloaded, memmap)
+            self.assertEqual(reloaded.tolist(), [3, 4, 3, 1, 2])
+            self.assertEqual(len(parse_calls), 1)
+
+            # Copy-on-write: modifying the loaded array leaves the snapshot intact.
+            reloaded += 1
+            self.assertEqual(load_snapshot(input_file_path, "fish", parse).tolist(), [3, 4, 3, 1, 2])
+
+            # Touched but identical input revalidates through its hash.
+            utime(input_file_path, ns=(0, 0))
+            load_snapshot(input_file_path, "fish", parse)
+            self.assertEqual(len(parse_calls), 1)
+
+            with open(input_file_path, "w") as input_file:
+                input_file.write("1,2,3,4,5,6\n")
+            self.assertEqual(load_snapshot(input_file_path, "fish", parse).tolist(), [1, 2, 3, 4, 5, 6])
+            self.assertEqual(len(parse_calls), 2)
+
+            self.assertEqual(load_snapshot(input_file_path, "pickled", lambda file_path: {"fish": 6}), {"fish": 6})
+            self.assertEqual(load_snapshot(input_file_path, "pickled", lambda file_path: None), {"fish": 6})
+
+            # A new version of the parser, or another parser under the same name, parses again.
+            self.assertEqual(load_snapshot(input_file_path, "pickled", lambda file_path: {"fish": 7}, version="2"), {"fish": 7})
+            self.assertEqual(load_snapshot(input_file_path, "pickled", lambda file_path: None, version="2"), {"fish": 7})
+            self.assertEqual(load_snapshot(input_file_path, "fish", lambda file_path: load_integers(file_path) * 2).tolist(),
+                             [2, 4, 6, 8, 10, 12])
+
+        print(f"Unittest {Tests.test_load_snapshot} was successful.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""tokenizer.py: Whole-buffer tokenizers turning line oriented puzzle inputs into typed columns in bulk"""
+from __future__ import annotations
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
+
+# Built-in modules
+from unittest import TestCase, main
+from os.path import isfile, join, dirname
+from re import compile, MULTILINE, Pattern
+from typing import TYPE_CHECKING, List, Sequence, Tuple, Union
+
+# numpy is imported by the numeric tokenizers only, so that solutions tokenizing names (Day 12) start without it.
+if TYPE_CHECKING:
+    from numpy import array, dtype as DType
+
+# "start-A": two names joined by a dash, compiled once for every load.
+EDGE_PATTERN: Pattern = compile(rb"^[ \t]*(\w+)-(\w+)[ \t\r]*$", MULTILINE)
+
+
+def line_starts(buffer: array) -> array:
+    """Offsets of the first byte of every non-blank line in a uint8 buffer."""
+    from numpy import array, int64, flatnonzero, concatenate
+    from common.loader import NEWLINE, CARRIAGE_RETURN
+
+    starts: array = concatenate([array([0], dtype=int64), flatnonzero(buffer == NEWLINE) + 1])
+    starts = starts[starts < len(buffer)]
+    return starts[(buffer[starts] != NEWLINE) & (buffer[starts] != CARRIAGE_RETURN)]
+
+def tokenize_commands(buffer: Union[bytes, array], words: Sequence[str], dtype: DType = "int32") -> Tuple[array, array]:
+    """Tokenizes "<word> <integer>" lines ("forward 5\\ndown 3\\n..."). Words are told apart by their first letter, so
+    each line costs a table lookup rather than a string comparison.
+
+    Args:
+        buffer (Union[bytes, array]): Raw file bytes.
+        words (Sequence[str]): Every accepted word, their first letters must differ.
+        dtype (DType, optional): dtype of the integer column. Defaults to int32.
+
+    Returns:
+        Tuple[array, array]: int8 index of each line's word in words and the integer of each line."""
+    from numpy import uint8, int8, frombuffer, full
+    from common.loader import decode_integers
+
+    buffer = frombuffer(buffer, dtype=uint8) if isinstance(buffer, bytes) else buffer
+    assert len({word[0] for word in words}) == len(words), "Command words must start with different letters"
+
+    codes_by_first_byte: array = full(256, -1, dtype=int8)
+    for code, word in enumerate(words):
+        codes_by_first_byte[ord(word[0])] = code
+
+    codes: array = codes_by_first_byte[buffer[line_starts(buffer)]]
+    units: array = decode_integers(buffer, dtype=dtype)
+    assert (codes >= 0).all(), f"Command lines must start with one of {list(words)}"
+    assert len(codes) == len(units), "Every command line must hold exactly one integer"
+
+    return codes, units
+
+def tokenize_segments(buffer: Union[bytes, array], dtype: DType = "int32") -> array:
+    """Tokenizes "x1,y1 -> x2,y2" lines.
+
+    Returns:
+        array: Array of shape (lines, 4) holding x1, y1, x2, y2."""
+    from common.loader import decode_integers
+
+    coordinates: array = decode_integers(buffer, dtype=dtype)
+    assert len(coordinates) % 4 == 0, "Every segment line must hold exactly four coordinates"
+    return coordinates.reshape(-1, 4)
+
+def tokenize_edges(buffer: Union[bytes, array]) -> List[Tuple[str, str]]:
+    """Tokenizes "start-A" lines with a single pass of EDGE_PATTERN over the whole buffer, in pure Python.
+
+    Returns:
+        List[Tuple[str, str]]: The two names of each line."""
+    buffer = buffer if isinstance(buffer, bytes) else bytes(buffer)
+    edges: List[Tuple[bytes, bytes]] = EDGE_PATTERN.findall(buffer)
+    # Non-blank lines, as line_starts counts them.
+    line_count: int = sum(1 for line in buffer.split(b"\n") if line[:1] not in (b"", b"\r"))
+    assert len(edges) == line_count, "Every edge line must be two names joined by a dash"
+    return [(left.decode(), right.decode()) for left, right in edges]
+
+def load_commands(file_path: str, words: Sequence[str], dtype: DType = "int32") -> Tuple[array, array]:
+    """Memory-maps file_path and tokenizes it with tokenize_commands."""
+    from common.loader import map_file
+    return tokenize_commands(map_file(file_path), words=words, dtype=dtype)
+
+def load_segments(file_path: str, dtype: DType = "int32") -> array:
+    """Memory-maps file_path and tokenizes it with tokenize_segments."""
+    from common.loader import map_file
+    return tokenize_segments(map_file(file_path), dtype=dtype)
+
+def load_edges(file_path: str) -> List[Tuple[str, str]]:
+    """Reads file_path and tokenizes it with tokenize_edges."""
+    assert isfile(file_path), f"File not found: {file_path}"
+
+    with open(file_path, "rb") as edge_file:
+        return tokenize_edges(edge_file.read())
+
+
+class Tests(TestCase):
+    def test_tokenize_commands(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_tokenize_commands}")
+
+        codes, units = tokenize_commands(b"forward 5\ndown 5\r\nforward 8\n\nup 3\n", words=["forward", "down", "up"])
+        self.assertEqual(codes.tolist(), [0, 1, 0, 2])
+        self.assertEqual(units.tolist(), [5, 5, 8, 3])
+
+        codes, units = load_commands(join(dirname(dirname(__file__)), "Day 2", "example.txt"), words=["forward", "down", "up"])
+        self.assertEqual(len(codes), 6)
+        self.assertEqual(units.sum(), 5 + 5 + 8 + 3 + 8 + 2)
+
+        with self.assertRaises(AssertionError):
+            tokenize_commands(b"forward 5\nbackward 2\n", words=["forward", "down", "up"])
+
+        print(f"Unittest {Tests.test_tokenize_commands} was successful.")
+
+    def test_tokenize_segments(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_tokenize_segments}")
+
+        self.assertEqual(tokenize_segments(b"0,9 -> 5,9\n8,0 -> 0,8").tolist(), [[0, 9, 5, 9], [8, 0, 0, 8]])
+        self.assertEqual(load_segments(join(dirname(dirname(__file__)), "Day 5", "example.txt")).shape, (10, 4))
+
+        print(f"Unittest {Tests.test_tokenize_segments} was successful.")
+
+    def test_tokenize_edges(self) -> None:
+        print(f"\nPerforming unittest: {Tests.test_tokenize_edges}")
+
+        self.assertEqual(tokenize_edges(b"start-A\nA-c\r\nb-end"), [("start", "A"), ("A", "c"), ("b", "end")])
+        self.assertEqual(len(load_edges(join(dirname(dirname(__file__)), "Day 12", "example.txt"))), 7)
+
+        with self.assertRaises(AssertionError):
+            tokenize_edges(b"start-A\nA c\n")
+        # Blank lines, ending with a carriage return or not, are skipped.
+        self.assertEqual(tokenize_edges(b"\nstart-A\r\n\r\nA-b\n\n"), [("start", "A"), ("A", "b")])
+
+        print(f"Unittest {Tests.test_tokenize_edges} was successful.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""run_all.py: Runs every day and part of Advent of Code 2021 in parallel with per-phase timing"""
+from __future__ import annotations
+
+__author__ = "Jacob Taylor Cassady"
+__email__ = "jacobtaylorcassady@outlook.com"
+
+# Built-in modules
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ProcessPoolExecutor
+from json import dumps
+from os import cpu_count
+from sys import exit
+from time import perf_counter
+from traceback import format_exc
+from typing import Any, Dict, List, Optional, Tuple
+
+# Local modules
+from common.cache import ResultCache, DEFAULT_CACHE_DIRECTORY, DEFAULT_MAXIMUM_BYTES, file_sha256, solver_version
+from common.days import SOLVERS, PARTS, discover_days, load_solution_module, input_file_path
+from common.instrumentation import INSTRUMENTATION, collapsed_stacks, enable, is_enabled, phase
+
+
+def run_part(day: int, part: str, input_name: str = "input.txt", result_cache: Optional[ResultCache] = None) -> Dict[str, Any]:
+    """Loads and solves a single part of a single day, timing each phase.
+
+    Args:
+        day (int): Day number.
+        part (str): Part name, "one" or "two".
+        input_name (str, optional): Puzzle input file inside the Day N folder, absolute paths are used as is.
+            Defaults to "input.txt".
+        result_cache (Optional[ResultCache], optional): Answers are looked up by (day, part, solver version, input
+            SHA-256) before loading and stored after solving. Defaults to None, always solving.
+
+    Returns:
+        Dict[str, Any]: day, part, answer, cached, import/hash/load/solve wall times in seconds and error (None on
+            success). Phases that did not run are None. With instrumentation enabled, profile holds the phase report."""
+    result: Dict[str, Any] = {"day": day, "part": part, "answer": None, "cached": False,
+                              "import_seconds": None, "hash_seconds": None, "load_seconds": None, "solve_seconds": None,
+                              "error": None}
+    # Pool workers are reused across parts, each part reports its own phases only.
+    INSTRUMENTATION.reset()
+
+    try:
+        start_time: float = perf_counter()
+        solution = load_solution_module(day=day)
+        result["import_seconds"] = perf_counter() - start_time
+        puzzle_input_file_path: str = input_file_path(day=day, input_name=input_name)
+
+        if result_cache is not None:
+            start_time = perf_counter()
+            cache_key: str = ResultCache.key(day=day, part=part, version=solver_version(solution),
+                                             input_sha256=file_sha256(puzzle_input_file_path))
+            result["answer"] = result_cache.get(cache_key)
+            result["cached"] = result["answer"] is not None
+            result["hash_seconds"] = perf_counter() - start_time
+
+            if result["cached"]:
+                return result
+
+        start_time = perf_counter()
+        with phase("load"):
+            puzzle = SOLVERS[day].load(solution, puzzle_input_file_path, part)
+        result["load_seconds"] = perf_counter() - start_time
+
+        start_time = perf_counter()
+        with phase("solve"):
+            answer = SOLVERS[day].solve[part](solution, puzzle)
+        result["solve_seconds"] = perf_counter() - start_time
+
+        result["answer"] = None if answer is None else int(answer)
+
+        if result_cache is not None and result["answer"] is not None:
+            result_cache.put(cache_key, result["answer"], day=day, part=part, input_file_path=puzzle_input_file_path)
+    except Exception:
+        result["error"] = format_exc()
+
+    if is_enabled():
+        result["profile"] = INSTRUMENTATION.report()
+
+    return result
+
+def run_all(days: List[int], input_name: str = "input.txt", workers: Optional[int] = None,
+            result_cache: Optional[ResultCache] = None) -> List[Dict[str, Any]]:
+    """Runs every part of every requested day in a process pool.
+
+    Args:
+        days (List[int]): Day numbers to run.
+        input_name (str, optional): Puzzle input file inside each Day N folder. Defaults to "input.txt".
+        workers (Optional[int], optional): Process count. Defaults to one worker per core.
+        result_cache (Optional[ResultCache], optional): Answer cache shared by the workers. Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: run_part results ordered by day then part."""
+    tasks: List[Tuple[int, str]] = [(day, part) for day in days for part in PARTS]
+
+    with ProcessPoolExecutor(max_workers=workers or cpu_count()) as executor:
+        futures = [executor.submit(run_part, day, part, input_name, result_cache) for day, part in tasks]
+        return [future.result() for future in futures]
+
+def format_table(results: List[Dict[str, Any]]) -> str:
+    def format_seconds(seconds: Optional[float]) -> str:
+        return "-" if seconds is None else f"{seconds:.4f}"
+
+    table_lines: List[str] = [f"{'Day':>3} {'Part':<4} {'Import (s)':>10} {'Hash (s)':>10} {'Load (s)':>10} {'Solve (s)':>10}  Answer",
+                              "-" * 71]
+
+    for result in results:
+        answer: str = "ERROR" if result["error"] is not None else str(result["answer"]) + (" (cached)" if result["cached"] else "")
+        table_lines.append(f"{result['day']:>3} {result['part']:<4} {format_seconds(result['import_seconds']):>10} "
+                           f"{format_seconds(result['hash_seconds']):>10} {format_seconds(result['load_seconds']):>10} "
+                           f"{format_seconds(result['solve_seconds']):>10}  {answer}")
+
+    return "\n".join(table_lines)
+
+def parse_arguments() -> Namespace:
+    argument_parser: ArgumentParser = ArgumentParser(description=__doc__.split(": ", 1)[1])
+    argument_parser.add_argument("--days", type=int, nargs="+", default=None,
+                                 help="Day numbers to run. Defaults to every Day N folder.")
+    argument_parser.add_argument("--input", dest="input_name", default="input.txt",
+                                 help="Puzzle input file name inside each Day N folder.")
+    argument_parser.add_argument("--workers", type=int, default=None,
+                                 help="Worker process count. Defaults to one per core.")
+    argument_parser.add_argument("--json", dest="json_file_path", default=None,
+                                 help="Write machine-readable results to this path, or '-' for stdout in place of the table.")
+    argument_parser.add_argument("--no-cache", dest="cache", action="store_false",
+                                 help="Always load and solve instead of reusing cached answers.")
+    argument_parser.add_argument("--cache-dir", dest="cache_directory", default=DEFAULT_CACHE_DIRECTORY,
+                                 help="Folder of the answer cache.")
+    argument_parser.add_argument("--cache-max-mb", dest="cache_maximum_megabytes", type=float,
+                                 default=DEFAULT_MAXIMUM_BYTES / 1024 / 1024,
+                                 help="Least recently used answers are evicted past this size.")
+    argument_parser.add_argument("--profile", dest="profile_prefix", default=None,
+                                 help="Instrument the solutions and write per-phase timings and memory peaks to "
+                                      "PROFILE_PREFIX.json and flame graph stacks to PROFILE_PREFIX.collapsed. "
+                                      "Implies --no-cache.")
+    return argument_parser.parse_args()
+
+def main() -> int:
+    arguments: Namespace = parse_arguments()
+    days: List[int] = arguments.days if arguments.days is not None else list(discover_days().keys())
+
+    if arguments.profile_prefix is not None:
+        # Before the workers start, so that the solutions they import are decorated whatever the start method.
+        enable()
+
+    result_cache: Optional[ResultCache] = ResultCache(cache_directory=arguments.cache_directory,
+                                                     maximum_bytes=int(arguments.cache_maximum_megabytes * 1024 * 1024)) \
+                                         if arguments.cache and arguments.profile_prefix is None else None
+
+    start_time: float = perf_counter()
+    results: List[Dict[str, Any]] = run_all(days=days, input_name=arguments.input_name, workers=arguments.workers,
+                                            result_cache=result_cache)
+    wall_seconds: float = perf_counter() - start_time
+    failed: bool = any(result["error"] is not None for result in results)
+
+    report: Dict[str, Any] = {"wall_seconds": wall_seconds, "success": not failed, "results": results}
+
+    if arguments.profile_prefix is not None:
+        with open(f"{arguments.profile_prefix}.json", "w") as profile_file:
+            profile_file.write(dumps({f"day_{result['day']};part_{result['part']}": result["profile"] for result in results}, indent=2))
+
+        with open(f"{arguments.profile_prefix}.collapsed", "w") as collapsed_file:
+            for result in results:
+                collapsed_file.write(collapsed_stacks(result["profile"], prefix=f"day_{result['day']};part_{result['part']};"))
+
+    if arguments.json_file_path == "-":
+        print(dumps(report, indent=2))
+    else:
+        print(format_table(results))
+        print(f"\nTotal wall time: {wall_seconds:.4f}s")
+
+        for result in results:
+            if result["error"] is not None:
+                print(f"\nDay {result['day']} part {result['part']} failed:\n{result['error']}")
+
+        if arguments.json_file_path is not None:
+            with open(arguments.json_file_path, "w") as json_file:
+                json_file.write(dumps(report, indent=2))
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    exit(main())